@@ -1,22 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox
-from collections import deque
-import random
-from queue import PriorityQueue # <-- Import PriorityQueue
+import argparse
+from escape_grid import (CELL_EMPTY, CELL_WALL, CELL_FIRE, CELL_START, CELL_END,
+                         CELL_PATH, CELL_VISITED, CELL_SMOKE, CELL_STAIRS, CELL_DOOR, CELL_OCCUPANT,
+                         FlatGrid, FloorGrid)
+from escape_cache import PathCache
+from escape_connectivity import ConnectivityIndex
+from escape_evacuation import DEFAULT_OCCUPANTS, EvacuationSimulation, place_occupants
+from escape_fire import DEFAULT_SPREAD_PROBABILITY, fire_arrival_times
+from escape_replan import DStarLite
+from escape_solver import ALGORITHMS, JumpTable, make_search
+from escape_terrain import STEP_COST, cost_map
+from escape_view import GridRenderer
 
 # --- Constants ---
 GRID_ROWS = 20
 GRID_COLS = 20
 CELL_SIZE = 30  # In pixels
-
-# Cell types
-CELL_EMPTY = 0
-CELL_WALL = 1
-CELL_FIRE = 2
-CELL_START = 3
-CELL_END = 4
-CELL_PATH = 5
-CELL_VISITED = 6 # New cell type for animation
+MAX_VIEW_WIDTH = 900 # Largest initial canvas; bigger grids are panned and zoomed
+MAX_VIEW_HEIGHT = 700
 
 # --- Theme and Colors ---
 THEME = {
@@ -41,34 +43,70 @@ CELL_COLORS = {
     CELL_START: THEME["GREEN"],
     CELL_END: THEME["RED"],
     CELL_PATH: THEME["ACCENT"],  # Cyan
-    CELL_VISITED: "#4A5A6A"     # Dark Slate Blue/Gray
+    CELL_VISITED: "#4A5A6A",    # Dark Slate Blue/Gray
+    CELL_SMOKE: "#8E8AA3",      # Hazy lavender
+    CELL_STAIRS: "#8D6E63",     # Brown
+    CELL_DOOR: "#C9A45C",       # Tan
+    CELL_OCCUPANT: "#FFEB3B",   # Yellow
+}
+
+# Search algorithms offered in the control panel (label -> escape_solver name)
+ALGORITHM_LABELS = {
+    "A*": "astar",
+    "Jump Point Search": "jps",
+    "Nearest Exit (Distance Field)": "field",
+    "Bidirectional BFS": "bidir",
+    "Weighted A* (terrain)": "weighted",
+    "Dijkstra (terrain)": "dijkstra",
+}
+
+# Cell type placed by each tool
+TOOL_CELLS = {
+    "start": CELL_START,
+    "end": CELL_END,
+    "wall": CELL_WALL,
+    "fire": CELL_FIRE,
+    "smoke": CELL_SMOKE,
+    "stairs": CELL_STAIRS,
+    "door": CELL_DOOR,
+    "empty": CELL_EMPTY,
 }
 
+# Cells the search animation may paint over (terrain stays visible under the path)
+MARKABLE_CELLS = (CELL_EMPTY, CELL_VISITED)
+
 # --- Main Application Class ---
 class FireEscapeFinder(tk.Frame):
-    def __init__(self, master):
+    def __init__(self, master, rows=GRID_ROWS, cols=GRID_COLS, cell_size=CELL_SIZE):
         super().__init__(master)
         self.master = master
         self.master.title("Fire Escape Path Finder")
-        self.master.resizable(False, False)
+        self.master.resizable(True, True)
         self.master.configure(bg=THEME["BG_PRIMARY"]) # Set main window background
 
         # --- Instance Variables ---
-        self.grid_data = [[CELL_EMPTY for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-        self.start_pos = None
-        self.end_pos = None
+        self.grid = FloorGrid(rows, cols) # Cell types + start/exit positions
+        self.connectivity = ConnectivityIndex(self.grid) # Answers "is any exit reachable?" without a search
+        self.cell_size = cell_size
         self.current_tool = "start" # Replaces tool_var
         self.tool_buttons = {}      # To store tool buttons for styling
         
-        # --- A* Algorithm Variables ---
-        # We replace the BFS queue with a PriorityQueue
-        self.open_set = PriorityQueue()
-        self.parent = {}
-        self.g_cost = {} # Cost from start to a node
-        self.open_set_hash = set() # To check if a node is in the priority queue
+        # --- A* Search (see escape_solver.py) ---
+        self.search = None # The search being animated
+        self.search_label = "" # Its algorithm, as shown in the control panel
+        self.search_algorithm = None # Its escape_solver name, None if it is not cacheable
+        self.path_cache = PathCache() # Results of earlier searches, by layout
+        self.jump_table = (None, None) # (grid version, JumpTable) for Jump Point Search
+        self.planner = None # D* Lite state kept between edits while live replanning
+        self.evacuation = None # The evacuation being animated
         
         self.animation_running = False
         self.animation_speed = tk.IntVar(value=50) # Default step delay in ms
+        self.algorithm_var = tk.StringVar(value="A*")
+        self.fire_spreads = tk.BooleanVar(value=False) # Plan against a simulated spreading fire
+        self.live_replanning = tk.BooleanVar(value=False) # Refresh the route after every edit
+        self.diagonal_moves = tk.BooleanVar(value=False) # 8-way movement for the terrain searches
+        self.occupant_count = tk.IntVar(value=DEFAULT_OCCUPANTS) # Occupants placed for an evacuation
 
         # --- Create UI ---
         self.setup_ui()
@@ -93,7 +131,8 @@ class FireEscapeFinder(tk.Frame):
         tools = [
             ("Start 🧑‍", "start"), ("Exit 🚪", "end"),
             ("Wall 🧱", "wall"), ("Fire 🔥", "fire"),
-            ("Eraser 🧹", "empty")
+            ("Smoke 🌫️", "smoke"), ("Stairs 🪜", "stairs"),
+            ("Door 🔑", "door"), ("Eraser 🧹", "empty")
         ]
         
         for i, (text, tool_id) in enumerate(tools):
@@ -115,6 +154,35 @@ class FireEscapeFinder(tk.Frame):
 
         tk.Frame(control_frame, height=2, bg=THEME["ACCENT"], relief="sunken").pack(fill="x", pady=15)
 
+        # --- Algorithm Selection ---
+        tk.Label(control_frame, text="Algorithm:", font=("Arial", 10, "bold"),
+                 bg=THEME["BG_PRIMARY"], fg=THEME["FG_PRIMARY"]).pack(anchor="w")
+        
+        algorithm_menu = tk.OptionMenu(control_frame, self.algorithm_var, *ALGORITHM_LABELS)
+        algorithm_menu.config(bg=THEME["BTN_BG"], fg=THEME["BTN_FG"],
+                              activebackground=THEME["BTN_ACTIVE_BG"], activeforeground=THEME["FG_PRIMARY"],
+                              relief="flat", highlightthickness=0, font=("Arial", 10))
+        algorithm_menu["menu"].config(bg=THEME["BTN_BG"], fg=THEME["BTN_FG"])
+        algorithm_menu.pack(fill="x", pady=(2, 2))
+
+        tk.Checkbutton(control_frame, text=f"Fire spreads (p={DEFAULT_SPREAD_PROBABILITY})",
+                       variable=self.fire_spreads,
+                       bg=THEME["BG_PRIMARY"], fg=THEME["FG_PRIMARY"], selectcolor=THEME["BG_SECONDARY"],
+                       activebackground=THEME["BG_PRIMARY"], activeforeground=THEME["FG_PRIMARY"],
+                       highlightthickness=0, font=("Arial", 10)).pack(anchor="w")
+
+        tk.Checkbutton(control_frame, text="8-way movement (terrain)",
+                       variable=self.diagonal_moves,
+                       bg=THEME["BG_PRIMARY"], fg=THEME["FG_PRIMARY"], selectcolor=THEME["BG_SECONDARY"],
+                       activebackground=THEME["BG_PRIMARY"], activeforeground=THEME["FG_PRIMARY"],
+                       highlightthickness=0, font=("Arial", 10)).pack(anchor="w")
+
+        tk.Checkbutton(control_frame, text="Live replanning (D* Lite)",
+                       variable=self.live_replanning, command=self.toggle_live_replanning,
+                       bg=THEME["BG_PRIMARY"], fg=THEME["FG_PRIMARY"], selectcolor=THEME["BG_SECONDARY"],
+                       activebackground=THEME["BG_PRIMARY"], activeforeground=THEME["FG_PRIMARY"],
+                       highlightthickness=0, font=("Arial", 10)).pack(anchor="w", pady=(0, 8))
+
         # --- Action Buttons ---
         self.find_path_button = tk.Button(control_frame, text="Find Escape Path", 
                                           command=self.start_pathfinding_animation, 
@@ -122,6 +190,24 @@ class FireEscapeFinder(tk.Frame):
                                           font=("Arial", 10, "bold"), relief="flat", height=2)
         self.find_path_button.pack(fill="x", pady=5)
         
+        # Stats of the last search (path length, nodes expanded)
+        self.search_stats_label = tk.Label(control_frame, text="", justify="left",
+                                           bg=THEME["BG_PRIMARY"], fg=THEME["FG_INACTIVE"],
+                                           font=("Arial", 9))
+        self.search_stats_label.pack(anchor="w")
+
+        # --- Evacuation (many occupants at once) ---
+        evacuation_frame = tk.Frame(control_frame, bg=THEME["BG_PRIMARY"])
+        evacuation_frame.pack(fill="x", pady=(5, 2))
+        tk.Label(evacuation_frame, text="Occupants:", bg=THEME["BG_PRIMARY"], fg=THEME["FG_PRIMARY"],
+                 font=("Arial", 10)).pack(side=tk.LEFT)
+        tk.Spinbox(evacuation_frame, from_=1, to=100000, increment=50, width=7, textvariable=self.occupant_count,
+                   bg=THEME["BG_SECONDARY"], fg=THEME["FG_PRIMARY"], buttonbackground=THEME["BTN_BG"],
+                   relief="flat", font=("Arial", 10)).pack(side=tk.LEFT, padx=4)
+        self.evacuate_button = tk.Button(evacuation_frame, text="Evacuate 👥", command=self.start_evacuation,
+                                         bg=THEME["BTN_BG"], fg=THEME["BTN_FG"], relief="flat")
+        self.evacuate_button.pack(side=tk.LEFT, fill="x", expand=True)
+        
         # Button sub-frame
         action_frame = tk.Frame(control_frame, bg=THEME["BG_PRIMARY"])
         action_frame.pack(fill="x", pady=2)
@@ -152,16 +238,28 @@ class FireEscapeFinder(tk.Frame):
 
         # --- Canvas (Left Side) ---
         self.canvas = tk.Canvas(self.master,
-                                width=GRID_COLS * CELL_SIZE,
-                                height=GRID_ROWS * CELL_SIZE,
+                                width=min(self.grid.cols * self.cell_size, MAX_VIEW_WIDTH),
+                                height=min(self.grid.rows * self.cell_size, MAX_VIEW_HEIGHT),
                                 bg=THEME["BG_SECONDARY"],
                                 borderwidth=0,
                                 highlightthickness=0)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
+        # Draws only the visible cells (see escape_view.py)
+        self.renderer = GridRenderer(self.canvas, self.grid, self.cell_size, CELL_COLORS,
+                                     outline=THEME["BG_PRIMARY"], default_color=THEME["BG_SECONDARY"])
+        self.pan_anchor = None
+
         # Bind mouse events
         self.canvas.bind("<Button-1>", self.handle_grid_click)
         self.canvas.bind("<B1-Motion>", self.handle_grid_click) # For dragging
+        for button in (2, 3): # Middle or right drag pans
+            self.canvas.bind(f"<ButtonPress-{button}>", self.start_pan)
+            self.canvas.bind(f"<B{button}-Motion>", self.pan_view)
+        self.canvas.bind("<MouseWheel>", self.zoom_view) # Windows / macOS
+        self.canvas.bind("<Button-4>", self.zoom_view)   # Linux wheel up
+        self.canvas.bind("<Button-5>", self.zoom_view)   # Linux wheel down
+        self.canvas.bind("<Configure>", lambda e: self.renderer.resize(e.width, e.height))
 
     def select_tool(self, tool_name):
         """Sets the active tool and updates button styles."""
@@ -183,118 +281,76 @@ class FireEscapeFinder(tk.Frame):
         self.selected_tool_label.config(text=f"Selected: {tool_text}")
 
     def draw_grid(self):
-        """Redraws the entire grid on the canvas based on grid_data."""
-        self.canvas.delete("all")
-        grid_outline_color = THEME["BG_PRIMARY"] # Grid lines
-        
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                x1 = col * CELL_SIZE
-                y1 = row * CELL_SIZE
-                x2 = x1 + CELL_SIZE
-                y2 = y1 + CELL_SIZE
-
-                cell_type = self.grid_data[row][col]
-                color = CELL_COLORS.get(cell_type, THEME["BG_SECONDARY"]) 
-
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=grid_outline_color, width=1)
+        """Brings the whole canvas up to date with the grid cells (only changed cells are redrawn)."""
+        self.renderer.refresh()
 
     def draw_cell(self, row, col, cell_type):
-        """Draws or updates a single cell (more efficient for animation)."""
-        x1 = col * CELL_SIZE
-        y1 = row * CELL_SIZE
-        x2 = x1 + CELL_SIZE
-        y2 = y1 + CELL_SIZE
-        
-        color = CELL_COLORS.get(cell_type, THEME["BG_SECONDARY"])
-        grid_outline_color = THEME["BG_PRIMARY"]
-        
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=grid_outline_color, width=1)
+        """Updates a single cell (more efficient for animation)."""
+        self.renderer.draw_cell(row, col, cell_type)
 
     def handle_grid_click(self, event):
         """Handles click-and-drag events on the canvas grid."""
         if self.animation_running:
             return # Don't allow edits while animating
             
-        try:
-            col = event.x // CELL_SIZE
-            row = event.y // CELL_SIZE
+        row, col = self.renderer.cell_at(event.x, event.y)
+
+        # Ensure click is within bounds
+        if self.grid.in_bounds(row, col):
+            self.set_cell(row, col)
 
-            # Ensure click is within bounds
-            if 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS:
-                self.set_cell(row, col)
-        except Exception:
-            pass # Ignore clicks outside the grid area
+    # --- Viewport ---
+    def start_pan(self, event):
+        self.pan_anchor = (event.x, event.y)
+
+    def pan_view(self, event):
+        """Drags the view along with the mouse."""
+        if self.pan_anchor is None:
+            return
+        x, y = self.pan_anchor
+        self.pan_anchor = (event.x, event.y)
+        self.renderer.pan(x - event.x, y - event.y)
+
+    def zoom_view(self, event):
+        """Zooms in or out around the mouse pointer."""
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.renderer.zoom(1.25 if zoom_in else 0.8, event.x, event.y)
 
     def set_cell(self, row, col):
         """Sets the type of a single cell based on the selected tool."""
         # Clear any existing path, as it's now invalid
         self.clear_path(redraw=False)
 
-        tool = self.current_tool # Use the instance variable
-        current_cell_type = self.grid_data[row][col]
-
-        # Prevent overwriting start/end with wall/fire
-        if current_cell_type in (CELL_START, CELL_END) and tool in ("wall", "fire"):
+        # The grid moves the old start/exit and protects them from walls and fire
+        changed = self.grid.paint(row, col, TOOL_CELLS[self.current_tool])
+        self.connectivity.update(changed)
+        if self.live_replanning.get():
+            self.planner.update(changed) # Only the part of the search the edit touched is redone
+            self.replan()
             return
-
-        new_type = CELL_EMPTY
-        if tool == "start":
-            # Remove old start if it exists
-            if self.start_pos:
-                r, c = self.start_pos
-                self.grid_data[r][c] = CELL_EMPTY
-                self.draw_cell(r, c, CELL_EMPTY)
-            # Set new start
-            self.start_pos = (row, col)
-            new_type = CELL_START
-
-        elif tool == "end":
-            # Remove old end if it exists
-            if self.end_pos:
-                r, c = self.end_pos
-                self.grid_data[r][c] = CELL_EMPTY
-                self.draw_cell(r, c, CELL_EMPTY)
-            # Set new end
-            self.end_pos = (row, col)
-            new_type = CELL_END
-
-        elif tool == "wall":
-            new_type = CELL_WALL
-        elif tool == "fire":
-            new_type = CELL_FIRE
-        elif tool == "empty":
-            # If we are erasing the start or end, update their positions
-            if (row, col) == self.start_pos:
-                self.start_pos = None
-            if (row, col) == self.end_pos:
-                self.end_pos = None
-            new_type = CELL_EMPTY
-
-        self.grid_data[row][col] = new_type
-        self.draw_cell(row, col, new_type) # Update just one cell
+        for r, c in changed:
+            self.draw_cell(r, c, self.grid[r, c]) # Update just the changed cells
 
     def clear_grid(self):
         """Resets the entire grid to empty."""
         if self.animation_running:
             return
             
-        self.grid_data = [[CELL_EMPTY for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-        self.start_pos = None
-        self.end_pos = None
+        self.grid.clear()
+        self.connectivity.rebuild()
         self.draw_grid()
+        self.reset_planner()
 
     def clear_path(self, redraw=True):
         """Removes only the path (CELL_PATH and CELL_VISITED) from the grid."""
         if self.animation_running:
             self.animation_running = False # Stop any running animation
             
-        for r in range(GRID_ROWS):
-            for c in range(GRID_COLS):
-                if self.grid_data[r][c] in (CELL_PATH, CELL_VISITED):
-                    self.grid_data[r][c] = CELL_EMPTY
+        self.grid.clear_path()
         
         self.find_path_button.config(text="Find Escape Path", state=tk.NORMAL)
+        self.evacuate_button.config(text="Evacuate 👥", state=tk.NORMAL)
+        self.search_stats_label.config(text="")
         
         if redraw:
             self.draw_grid()
@@ -304,44 +360,101 @@ class FireEscapeFinder(tk.Frame):
         if self.animation_running:
             return
             
-        self.clear_grid()
-        
-        # Place Start
-        start_r, start_c = random.randint(0, GRID_ROWS-1), random.randint(0, GRID_COLS-1)
-        self.set_cell(start_r, start_c) # Use set_cell to handle logic
-        
-        # Place End (ensure it's not the same as start)
-        self.current_tool = "end"
-        end_r, end_c = start_r, start_c
-        while (end_r, end_c) == self.start_pos:
-            end_r, end_c = random.randint(0, GRID_ROWS-1), random.randint(0, GRID_COLS-1)
-        self.set_cell(end_r, end_c)
-        
-        # Place Obstacles
-        wall_percent = 0.20 # 20% walls
-        fire_percent = 0.05 # 5% fire
-        
-        for r in range(GRID_ROWS):
-            for c in range(GRID_COLS):
-                if (r,c) == self.start_pos or (r,c) == self.end_pos:
-                    continue
-                
-                rand = random.random()
-                if rand < fire_percent:
-                    self.current_tool = "fire"
-                    self.set_cell(r, c)
-                elif rand < fire_percent + wall_percent:
-                    self.current_tool = "wall"
-                    self.set_cell(r, c)
-                    
-        self.select_tool("start") # Reset tool to start
+        # 20% walls, 5% fire
+        self.grid.randomize(wall_percent=0.20, fire_percent=0.05)
+        self.connectivity.rebuild()
+        self.draw_grid()
+        self.reset_planner()
+
+    # --- Live Replanning ---
+    def toggle_live_replanning(self):
+        if self.animation_running:
+            self.live_replanning.set(False)
+            return
+        self.reset_planner()
+        if not self.live_replanning.get():
+            self.clear_path()
+
+    def reset_planner(self):
+        """Starts a new D* Lite search for the current layout (after bulk changes)."""
+        self.planner = None
+        if self.live_replanning.get():
+            self.planner = DStarLite(self.grid)
+            self.replan()
+
+    def replan(self):
+        """Repairs the live route and redraws only the cells that changed."""
+        result = self.planner.plan()
+        self.grid.clear_path()
+        for r, c in result.path[1:-1]:
+            if self.grid.cells[r, c] in MARKABLE_CELLS:
+                self.grid.cells[r, c] = CELL_PATH
         self.draw_grid()
+        if self.grid.start is None or not self.grid.exits:
+            self.search_stats_label.config(text="D* Lite (live): set a start and an exit")
+            return
+        length = f"{result.cost} steps" if result.found else "no path"
+        self.search_stats_label.config(text=f"D* Lite (live): {length}\n{result.expanded} nodes expanded")
+
+    # --- Evacuation ---
+    def start_evacuation(self):
+        """Places random occupants and animates them walking to the exits, one tick per step."""
+        if self.animation_running: # Only an evacuation can be running: the button is disabled during searches
+            self.end_evacuation()
+            return
+        if not self.grid.exits:
+            messagebox.showwarning("Error", "Please set an Exit Point (🚪).")
+            return
+
+        self.clear_path(redraw=True)
+        passable = self.grid.passable_mask()
+        try:
+            occupants = place_occupants(passable, self.grid.exits, self.occupant_count.get())
+        except (tk.TclError, ValueError) as e: # Not a number, or more occupants than free cells
+            messagebox.showwarning("Error", f"Cannot place the occupants: {e}")
+            return
+        self.evacuation = EvacuationSimulation(passable, self.grid.exits, occupants)
+        for r, c in self.evacuation.occupied():
+            self.draw_cell(r, c, CELL_OCCUPANT)
+
+        self.animation_running = True
+        self.evacuate_button.config(text="Stop Evacuation")
+        self.find_path_button.config(state=tk.DISABLED)
+        self.animate_evacuation_step()
+
+    def animate_evacuation_step(self):
+        """Advances the evacuation one tick and redraws only the cells that emptied or filled."""
+        if not self.animation_running:
+            self.end_evacuation()
+            return
 
-    def calculate_heuristic(self, pos1, pos2):
-        """Calculates the Manhattan distance heuristic for A*."""
-        r1, c1 = pos1
-        r2, c2 = pos2
-        return abs(r1 - r2) + abs(c1 - c2)
+        vacated, entered = self.evacuation.step()
+        for r, c in vacated:
+            self.draw_cell(r, c, self.grid[r, c])
+        for r, c in entered:
+            self.draw_cell(r, c, CELL_OCCUPANT)
+
+        if self.evacuation.done:
+            self.end_evacuation()
+            self.show_evacuation_stats(self.evacuation.result)
+            return
+        self.search_stats_label.config(text=f"Evacuation: tick {self.evacuation.tick}, "
+                                            f"{len(self.evacuation.active)} still inside")
+        self.master.after(self.animation_speed.get(), self.animate_evacuation_step)
+
+    def end_evacuation(self):
+        """Stops the evacuation animation and takes the occupants off the canvas."""
+        self.animation_running = False
+        self.evacuate_button.config(text="Evacuate 👥")
+        self.find_path_button.config(state=tk.NORMAL)
+        self.draw_grid() # Occupants are only drawn, never written to the grid
+
+    def show_evacuation_stats(self, result):
+        """Shows the total evacuation time and the cells where the crowd waited longest."""
+        bottlenecks = ", ".join(f"({r}, {c})" for (r, c), _ in result.bottlenecks(3)) or "none"
+        self.search_stats_label.config(
+            text=f"Evacuation: {result.evacuated} out in {result.evacuation_time} ticks, {result.trapped} trapped\n"
+                 f"Bottlenecks: {bottlenecks}")
 
     def start_pathfinding_animation(self):
         """Prepares and starts the step-by-step A* animation."""
@@ -349,151 +462,155 @@ class FireEscapeFinder(tk.Frame):
         if self.animation_running:
             self.animation_running = False
             self.find_path_button.config(text="Find Escape Path", state=tk.NORMAL)
+            self.evacuate_button.config(state=tk.NORMAL)
             return
             
-        if not self.start_pos:
+        if not self.grid.start:
             messagebox.showwarning("Error", "Please set a Start Point (🧑‍).")
             return
-        if not self.end_pos:
+        if not self.grid.exits:
             messagebox.showwarning("Error", "Please set an Exit Point (🚪).")
             return
 
         # 2. Clear old path
         self.clear_path(redraw=True) # Redraw to clear any old path
 
-        # 3. A* Setup
-        self.open_set = PriorityQueue()
-        self.parent = {self.start_pos: None}
-        
-        # Initialize g_cost for all nodes to infinity
-        self.g_cost = {}
-        # g_cost for start node is 0
-        self.g_cost[self.start_pos] = 0
-        
-        # Calculate f_cost for start node
-        h_cost = self.calculate_heuristic(self.start_pos, self.end_pos)
-        f_cost = self.g_cost[self.start_pos] + h_cost
-        
-        # Add start node to the priority queue
-        # Items are (f_cost, h_cost, position)
-        # We add h_cost as a tie-breaker
-        self.open_set.put((f_cost, h_cost, self.start_pos))
-        self.open_set_hash = {self.start_pos}
+        # Walls and fire cut the start off from every exit: no search needed
+        if not self.connectivity.reachable(self.grid.start, self.grid.exits):
+            self.search_stats_label.config(text="No path: start and exits are not connected")
+            messagebox.showinfo("No Path", "No valid escape path could be found!")
+            return
+
+        # 3. Search Setup (the search reads a snapshot of the passable cells)
+        self.search_label = self.algorithm_var.get()
+        algorithm = ALGORITHM_LABELS[self.search_label]
+        fire_time = None
+        costs = None
+        diagonal = False
+        if ALGORITHMS[algorithm].weighted:
+            # Terrain costs live in the cell types, which the layout-keyed cache ignores
+            costs = cost_map(self.grid.cells)
+            diagonal = self.diagonal_moves.get()
+            if diagonal:
+                self.search_label += " (8-way)"
+        if self.fire_spreads.get():
+            if not ALGORITHMS[algorithm].supports_fire_time:
+                messagebox.showwarning("Error", f"{self.search_label} cannot plan around spreading fire. Use A*.")
+                return
+            # One simulated run; the route must reach each cell before the fire does
+            fire_time = fire_arrival_times(self.grid.cells, DEFAULT_SPREAD_PROBABILITY)[0]
+            self.search_label += " (spreading fire)"
+        elif costs is None:
+            # Same layout, start, exits and algorithm as an earlier search: reuse it
+            result = self.path_cache.get(self.grid, algorithm)
+            if result is not None:
+                self.search_label += " (cached)"
+                self.show_search_stats(result)
+                self.reconstruct_path_animation(result)
+                return
+        self.search_algorithm = None if fire_time is not None or costs is not None else algorithm
+        passable = self.grid.passable_mask()
+        jump_table = self.jump_table_for(passable) if algorithm == "jps" else None
+        self.search = make_search(passable, self.grid.start, self.grid.exits, algorithm,
+                                  fire_time, costs, diagonal, jump_table)
         
         self.animation_running = True
         self.find_path_button.config(text="Stop Animation", state=tk.NORMAL)
+        self.evacuate_button.config(state=tk.DISABLED) # Evacuating would cut the search short
         
         # 4. Start the animation loop
         self.animate_astar_step()
 
+    def jump_table_for(self, passable):
+        """JPS+ jump table of the current layout, rebuilt only after the grid was edited."""
+        version, table = self.jump_table
+        if version != self.grid.version:
+            table = JumpTable(FlatGrid(passable))
+            self.jump_table = (self.grid.version, table)
+        return table
+
     def animate_astar_step(self):
-        """Performs one step of the A* algorithm and schedules the next."""
+        """Performs one step of the selected search and schedules the next."""
         if not self.animation_running:
             self.find_path_button.config(text="Find Escape Path", state=tk.NORMAL)
+            self.evacuate_button.config(state=tk.NORMAL)
             return # Animation was stopped
-            
-        if self.open_set.empty():
-            # Queue is empty, but path not found
-            self.animation_running = False
-            self.find_path_button.config(text="Find Escape Path", state=tk.NORMAL)
-            messagebox.showinfo("No Path", "No valid escape path could be found!")
-            return
 
-        # Get the node with the lowest f_cost
-        # current_data is (f_cost, h_cost, position)
-        current_data = self.open_set.get()
-        current_pos = current_data[2]
-        self.open_set_hash.remove(current_pos)
+        # Expand the node with the lowest f_cost
+        opened = self.search.step()
 
-        current_r, current_c = current_pos
-        
-        # --- Goal Check ---
-        if current_pos == self.end_pos:
+        # Animate the "visited" (open set) cells
+        for r, c in opened:
+            if self.grid.cells[r, c] == CELL_EMPTY:
+                self.grid.cells[r, c] = CELL_VISITED
+                self.draw_cell(r, c, CELL_VISITED)
+
+        if self.search.done:
             self.animation_running = False
             self.find_path_button.config(text="Find Escape Path", state=tk.NORMAL)
-            self.reconstruct_path_animation() # Start drawing the final path
+            self.evacuate_button.config(state=tk.NORMAL)
+            self.show_search_stats(self.search.result)
+            if self.search_algorithm is not None:
+                self.path_cache.put(self.grid, self.search_algorithm, self.search.result)
+            if self.search.result.found:
+                self.reconstruct_path_animation(self.search.result) # Start drawing the final path
+            else:
+                messagebox.showinfo("No Path", "No valid escape path could be found!")
             return
 
-        # --- Explore Neighbors ---
-        # (Up, Down, Left, Right)
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]: 
-            nr, nc = current_r + dr, current_c + dc
-            neighbor_pos = (nr, nc)
-
-            # Check if neighbor is valid
-            if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS:
-                cell_type = self.grid_data[nr][nc]
-                is_obstacle = cell_type in (CELL_WALL, CELL_FIRE)
-                
-                if is_obstacle:
-                    continue
-
-                # Calculate temporary g_cost
-                # Cost to move from one cell to another is 1
-                temp_g_cost = self.g_cost[current_pos] + 1
-                
-                # Check if this path to the neighbor is better
-                if temp_g_cost < self.g_cost.get(neighbor_pos, float('inf')):
-                    # This is a better path, update costs and parent
-                    self.parent[neighbor_pos] = current_pos
-                    self.g_cost[neighbor_pos] = temp_g_cost
-                    
-                    h_cost = self.calculate_heuristic(neighbor_pos, self.end_pos)
-                    f_cost = temp_g_cost + h_cost
-                    
-                    # Add to open set if it's not already there
-                    if neighbor_pos not in self.open_set_hash:
-                        self.open_set.put((f_cost, h_cost, neighbor_pos))
-                        self.open_set_hash.add(neighbor_pos)
-                        
-                        # Animate the "visited" (open set) cell
-                        if neighbor_pos != self.end_pos:
-                            self.grid_data[nr][nc] = CELL_VISITED
-                            self.draw_cell(nr, nc, CELL_VISITED)
-
         # Schedule the next step
         self.master.after(self.animation_speed.get(), self.animate_astar_step)
         
-    def reconstruct_path_animation(self):
-        """Animates the drawing of the final path from end to start."""
-        path = []
-        curr = self.end_pos
-        while curr != self.start_pos:
-            if curr not in self.parent: # Should not happen if path found
-                break
-            path.append(curr)
-            curr = self.parent[curr]
-        
+    def show_search_stats(self, result):
+        """Shows the path length and expansion count of a finished search."""
+        length = f"{result.cost} steps" if result.found else "no path"
+        if result.found and result.path_cost is not None: # Terrain search: total cost in ordinary steps
+            length += f", cost {result.path_cost / STEP_COST:g}"
+        expanded = f"{result.expanded} nodes expanded"
+        if hasattr(result, "expanded_forward"): # Bidirectional: work per frontier
+            expanded += f"\n({result.expanded_forward} from start, {result.expanded_backward} from exits)"
+        self.search_stats_label.config(text=f"{self.search_label}: {length}\n{expanded}")
+
+    def reconstruct_path_animation(self, result):
+        """Animates the drawing of the final path from start to the exit it reached."""
+        # Path cells between the start and the exit
+        path = result.path[1:-1]
         if not path:
             return
 
         # Start a separate animation to draw the path
         def draw_next_path_segment(path_index):
-            if path_index < 0:
+            if path_index >= len(path):
                 return # Done
                 
             r, c = path[path_index]
-            if (r, c) != self.end_pos:
-                self.grid_data[r][c] = CELL_PATH
+            if self.grid.cells[r, c] in MARKABLE_CELLS:
+                self.grid.cells[r, c] = CELL_PATH
                 self.draw_cell(r, c, CELL_PATH)
             
             # Schedule the next segment
             self.master.after(max(10, self.animation_speed.get() // 2), 
-                              lambda: draw_next_path_segment(path_index - 1))
+                              lambda: draw_next_path_segment(path_index + 1))
 
-        # Start drawing from the cell *before* the end
-        draw_next_path_segment(len(path) - 1)
+        # Start drawing from the cell *after* the start
+        draw_next_path_segment(0)
 
 
 # --- Main execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fire Escape Path Finder")
+    parser.add_argument("--rows", type=int, default=GRID_ROWS, help=f"Grid rows (default: {GRID_ROWS})")
+    parser.add_argument("--cols", type=int, default=GRID_COLS, help=f"Grid columns (default: {GRID_COLS})")
+    parser.add_argument("--cell-size", type=int, default=CELL_SIZE, help=f"Cell size in pixels (default: {CELL_SIZE})")
+    args = parser.parse_args()
+
     root = tk.Tk()
     
     # Configure modal dialogs for dark theme (a bit of a hack for tkinter)
     root.tk_setPalette(background=THEME["BG_PRIMARY"], foreground=THEME["FG_PRIMARY"],
                       activeBackground=THEME["BTN_ACTIVE_BG"], activeForeground=THEME["FG_PRIMARY"])
     
-    app = FireEscapeFinder(root)
+    app = FireEscapeFinder(root, rows=args.rows, cols=args.cols, cell_size=args.cell_size)
     root.mainloop()
 
 
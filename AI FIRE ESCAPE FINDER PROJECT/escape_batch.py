@@ -0,0 +1,191 @@
+"""Monte Carlo evaluation of random floor layouts, without the GUI.
+
+Generates many random layouts for a wall/fire density, solves them all in a
+process pool and reports how often an exit is reachable, how long the
+escape paths are and how much work the solver did:
+
+    python escape_batch.py --trials 10000 --walls 0.1 0.2 0.3 --fires 0 0.05
+
+Every trial draws its layout from its own seed (derived from --seed, the
+sweep point and the trial number), so results do not depend on the number
+of worker processes.
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from escape_connectivity import is_reachable
+from escape_grid import FloorGrid
+from escape_solver import ALGORITHMS, find_path
+
+DEFAULT_TRIALS = 1000
+DEFAULT_CHUNK_SIZE = 200 # Trials per pool task
+STATS_COLUMNS = ["wall_percent", "fire_percent", "trials", "reachability_rate",
+                 "path_length_mean", "path_length_p50", "path_length_p90", "path_length_max",
+                 "expanded_mean", "expanded_p90"]
+
+
+class BatchStats:
+    """Outcome of a batch of trials: one entry per trial in each array."""
+
+    def __init__(self, found, cost, expanded):
+        self.found = found       # bool, an exit was reachable
+        self.cost = cost         # int32, path length (-1 when not found)
+        self.expanded = expanded # int32, nodes expanded by the solver
+
+    @property
+    def trials(self):
+        return len(self.found)
+
+    @property
+    def reachability_rate(self):
+        return float(self.found.mean()) if self.trials else 0.0
+
+    @property
+    def path_lengths(self):
+        return self.cost[self.found]
+
+    def summary(self):
+        """Aggregate statistics as a dict (path length figures cover reachable trials only)."""
+        lengths = self.path_lengths
+        summary = {"trials": self.trials, "reachability_rate": self.reachability_rate}
+        if len(lengths):
+            summary.update(path_length_mean=float(lengths.mean()),
+                           path_length_p50=float(np.percentile(lengths, 50)),
+                           path_length_p90=float(np.percentile(lengths, 90)),
+                           path_length_max=int(lengths.max()))
+        else:
+            summary.update(path_length_mean=None, path_length_p50=None, path_length_p90=None,
+                           path_length_max=None)
+        if self.trials:
+            summary.update(expanded_mean=float(self.expanded.mean()),
+                           expanded_p90=float(np.percentile(self.expanded, 90)))
+        else:
+            summary.update(expanded_mean=None, expanded_p90=None)
+        return summary
+
+    @classmethod
+    def concatenate(cls, parts):
+        if not parts:
+            return cls(np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+        return cls(*(np.concatenate(arrays) for arrays in zip(*((p.found, p.cost, p.expanded) for p in parts))))
+
+    def __repr__(self):
+        return f"BatchStats(trials={self.trials}, reachability_rate={self.reachability_rate:.3f})"
+
+
+def solve_trials(point, first, count, wall_percent, fire_percent, rows, cols, exit_count, algorithm, seed):
+    """Worker task: generates and solves trials first..first+count-1 of one sweep point."""
+    grid = FloorGrid(rows, cols)
+    found = np.zeros(count, dtype=bool)
+    cost = np.full(count, -1, dtype=np.int32)
+    expanded = np.zeros(count, dtype=np.int32)
+    for i in range(count):
+        grid.randomize(wall_percent, fire_percent, rng=np.random.default_rng([seed, point, first + i]),
+                       exit_count=exit_count)
+        passable = grid.passable_mask()
+        if not is_reachable(passable, grid.start, grid.exits):
+            continue # Not connected: skip the search (0 nodes expanded)
+        result = find_path(passable, grid.start, grid.exits, algorithm)
+        found[i] = result.found
+        cost[i] = result.cost if result.found else -1
+        expanded[i] = result.expanded
+    return point, BatchStats(found, cost, expanded)
+
+
+def sweep(wall_percents, fire_percents, trials=DEFAULT_TRIALS, rows=20, cols=20, exit_count=1,
+          algorithm="astar", seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Evaluates every (wall_percent, fire_percent) combination.
+
+    Layouts whose start and exits lie in different connected components are
+    recognised by component labelling and not searched (0 nodes expanded).
+    Returns [(wall_percent, fire_percent, BatchStats)] in sweep order. All
+    points share one process pool (``workers`` processes, default one per
+    CPU; 1 runs everything in this process).
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Available: {', '.join(ALGORITHMS)}")
+    points = [(wall, fire) for wall in wall_percents for fire in fire_percents]
+    tasks = [(point, first, min(chunk_size, trials - first), wall, fire, rows, cols, exit_count, algorithm, seed)
+             for point, (wall, fire) in enumerate(points)
+             for first in range(0, trials, chunk_size)]
+
+    workers = workers or os.cpu_count() or 1
+    parts = [[] for _ in points]
+    if workers == 1:
+        outcomes = (solve_trials(*task) for task in tasks)
+        for point, stats in outcomes:
+            parts[point].append(stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for point, stats in pool.map(solve_trials, *zip(*tasks)):
+                parts[point].append(stats)
+    return [(wall, fire, BatchStats.concatenate(point_parts)) for (wall, fire), point_parts in zip(points, parts)]
+
+
+def evaluate(trials=DEFAULT_TRIALS, wall_percent=0.20, fire_percent=0.05, **kwargs):
+    """Evaluates one wall/fire density; takes the same options as sweep() and returns its BatchStats."""
+    return sweep([wall_percent], [fire_percent], trials, **kwargs)[0][2]
+
+
+def stats_rows(results):
+    """Flattens sweep() results into one dict per sweep point (STATS_COLUMNS)."""
+    for wall, fire, stats in results:
+        yield {"wall_percent": wall, "fire_percent": fire, **stats.summary()}
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="escape_batch", description="Monte Carlo evaluation of random floor layouts")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS,
+                        help=f"Layouts per wall/fire combination (default: {DEFAULT_TRIALS})")
+    parser.add_argument("--walls", type=float, nargs="+", default=[0.20], help="Wall densities (default: 0.20)")
+    parser.add_argument("--fires", type=float, nargs="+", default=[0.05], help="Fire densities (default: 0.05)")
+    parser.add_argument("--rows", type=int, default=20, help="Grid rows (default: 20)")
+    parser.add_argument("--cols", type=int, default=20, help="Grid columns (default: 20)")
+    parser.add_argument("--exits", type=int, default=1, help="Exits per layout (default: 1)")
+    parser.add_argument("--algorithm", choices=list(ALGORITHMS), default="astar", help="Solver (default: astar)")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Solver processes (default: one per CPU, 1 disables the pool)")
+    parser.add_argument("--out", default=None, help="Also write the table to this .csv file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trials < 1 or args.rows < 1 or args.cols < 1:
+        print("--trials, --rows and --cols must be at least 1", file=sys.stderr)
+        return 2
+
+    results = sweep(args.walls, args.fires, args.trials, args.rows, args.cols, args.exits,
+                    args.algorithm, args.seed, args.workers)
+    rows = list(stats_rows(results))
+
+    print("  ".join(f"{column:>17}" for column in STATS_COLUMNS))
+    for row in rows:
+        print("  ".join(f"{format_value(row[column]):>17}" for column in STATS_COLUMNS))
+
+    if args.out:
+        try:
+            with open(args.out, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=STATS_COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+        except OSError as e:
+            print(f"Error writing results: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
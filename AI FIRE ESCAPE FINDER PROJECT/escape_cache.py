@@ -0,0 +1,99 @@
+"""Cache of escape search results for the Fire Escape Finder.
+
+Planners flip between a handful of layouts, so solved searches are kept in
+an LRU cache keyed by what decides the answer: a hash of the passable
+cells (and the grid shape), the start, the exits and the algorithm. Path
+and visited markings do not affect the key, so clearing the path and
+searching again is a hit.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from escape_grid import OBSTACLES
+
+MAX_CACHED_RESULTS = 32
+
+
+class PathCache:
+    """LRU cache of SearchResults for FloorGrid layouts.
+
+    Besides exact hits, get() keeps the most recent result valid across
+    small edits: if the only cells painted since it was solved are new
+    walls or fire away from its path, the path is still there and nothing
+    shorter can have appeared, so it is reused without searching (an
+    unreachable exit stays unreachable the same way). Any edit that opens
+    a cell forces a new search.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_RESULTS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # key -> SearchResult
+        self._latest = None # (grid id, version, start, exits, algorithm, result) of the last put()
+        self._digest = (None, None, None) # (grid id, version, digest) of the last hashed layout
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._latest = None
+
+    def layout_digest(self, grid):
+        """Hash of the passable cells (remembered for the grid's current version)."""
+        grid_id, version, digest = self._digest
+        if grid_id != id(grid) or version != grid.version:
+            mask = np.packbits(grid.passable_mask())
+            digest = hashlib.blake2b(mask.tobytes(), digest_size=16).hexdigest()
+            self._digest = (id(grid), grid.version, digest)
+        return digest
+
+    def key(self, grid, algorithm):
+        return (grid.shape, self.layout_digest(grid), grid.start, tuple(grid.exits), algorithm)
+
+    def get(self, grid, algorithm):
+        """Returns the cached SearchResult for the grid's current layout, or None."""
+        key = self.key(grid, algorithm)
+        result = self._entries.get(key)
+        if result is None:
+            result = self._still_valid(grid, algorithm)
+            if result is not None:
+                self.put(grid, algorithm, result)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, grid, algorithm, result):
+        """Stores the result of searching the grid's current layout."""
+        key = self.key(grid, algorithm)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._latest = (id(grid), grid.version, grid.start, tuple(grid.exits), algorithm, result)
+
+    def _still_valid(self, grid, algorithm):
+        """The latest result, if the edits since then cannot have changed it."""
+        if self._latest is None:
+            return None
+        grid_id, version, start, exits, latest_algorithm, result = self._latest
+        if (grid_id, start, exits, latest_algorithm) != (id(grid), grid.start, tuple(grid.exits), algorithm):
+            return None
+        changes = grid.changes_since(version)
+        if changes is None:
+            return None
+        on_path = set(result.path)
+        for pos, old_type in changes.items():
+            was_blocked = old_type in OBSTACLES
+            blocked = grid[pos] in OBSTACLES
+            if was_blocked == blocked:
+                continue
+            if was_blocked or pos in on_path:
+                return None # Opened a cell, or blocked the path
+        return result
@@ -0,0 +1,162 @@
+"""Connected components of the passable cells, for instant "no path" answers.
+
+Two cells are connected when a 4-neighbour walk over passable cells joins
+them, so an exit is reachable from the start exactly when they share a
+component. Labelling uses scipy.ndimage.label when SciPy is installed and a
+NumPy union-find over row runs otherwise.
+"""
+import numpy as np
+
+from escape_grid import OBSTACLES
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+
+def label_components(passable):
+    """Labels the 4-connected components of a boolean mask.
+
+    Returns (labels, count): labels is an int32 array with 0 on blocked cells
+    and 1..count on passable ones.
+    """
+    passable = np.asarray(passable, dtype=bool)
+    if ndimage is not None:
+        labels, count = ndimage.label(passable)
+        return labels.astype(np.int32, copy=False), int(count)
+
+    # Fallback: number the horizontal runs, then union runs that touch vertically
+    rows, cols = passable.shape
+    run_starts = passable & ~np.pad(passable, ((0, 0), (1, 0)))[:, :-1]
+    run_id = np.cumsum(run_starts.ravel()).reshape(rows, cols) * passable
+    run_count = int(run_id.max()) if run_id.size else 0
+    touching = passable[:-1] & passable[1:]
+    pairs = np.unique(run_id[:-1][touching].astype(np.int64) * (run_count + 1) + run_id[1:][touching])
+    upper, lower = np.divmod(pairs, run_count + 1)
+
+    # Hook each run onto the smallest run it touches, then jump pointers,
+    # until both ends of every pair agree
+    root = np.arange(run_count + 1, dtype=np.int64)
+    while len(upper):
+        root_upper, root_lower = root[upper], root[lower]
+        differ = root_upper != root_lower
+        if not differ.any():
+            break
+        root_upper, root_lower = root_upper[differ], root_lower[differ]
+        smaller = np.minimum(root_upper, root_lower)
+        np.minimum.at(root, root_upper, smaller)
+        np.minimum.at(root, root_lower, smaller)
+        while True:
+            jumped = root[root]
+            if np.array_equal(jumped, root):
+                break
+            root = jumped
+    unique_roots, component = np.unique(root[1:], return_inverse=True)
+    run_label = np.concatenate([[0], component + 1]).astype(np.int32)
+    return run_label[run_id], len(unique_roots)
+
+
+def is_reachable(passable, start, exits):
+    """One-off check: can any exit be reached from start?"""
+    labels, count = label_components(passable)
+    rows, cols = labels.shape
+
+    def label(pos):
+        return labels[pos] if 0 <= pos[0] < rows and 0 <= pos[1] < cols else 0
+
+    start_label = label(start)
+    return start_label != 0 and any(label(pos) == start_label for pos in exits)
+
+
+class ConnectivityIndex:
+    """Component labels of a FloorGrid, kept up to date as cells are painted.
+
+    Call update(changed_cells) after editing cells (FloorGrid.paint() returns
+    them) and rebuild() after bulk changes. Opening a cell merges the
+    components around it in a union-find over labels, which is O(1).
+    Blocking a cell may split its component, so the component is only
+    marked dirty; dirty components are relabelled in one pass the next time
+    a query needs them. Queries on a clean index are O(1).
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        """Relabels the whole grid."""
+        self.labels, count = label_components(self.grid.passable_mask())
+        self._parent = list(range(count + 1)) # Label -> label it was merged into
+        self._dirty = set() # Roots of components that may have split
+
+    def find(self, label):
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        self._parent[root_b] = root_a
+        if root_b in self._dirty:
+            self._dirty.discard(root_b)
+            self._dirty.add(root_a)
+        return root_a
+
+    def update(self, cells):
+        """Brings the labels up to date after the given [(row, col)] cells changed."""
+        labels, grid_cells = self.labels, self.grid.cells
+        rows, cols = labels.shape
+        for row, col in cells:
+            passable = grid_cells[row, col] not in OBSTACLES
+            label = labels[row, col]
+            if label and not passable:
+                self._dirty.add(self.find(label))
+                labels[row, col] = 0
+            elif passable and not label:
+                label = len(self._parent)
+                self._parent.append(label)
+                labels[row, col] = label
+                for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                    if 0 <= r < rows and 0 <= c < cols and labels[r, c]:
+                        self.union(label, labels[r, c])
+
+    def _relabel_dirty(self):
+        """Relabels every cell of the dirty components in one pass over the grid."""
+        parent = np.array(self._parent, dtype=np.int64)
+        while True: # Pointer jumping: every label ends up pointing at its root
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        dirty = np.zeros(len(parent), dtype=bool)
+        dirty[list(self._dirty)] = True
+        mask = dirty[parent[self.labels]] & (self.labels > 0)
+
+        sub_labels, count = label_components(mask)
+        first = len(parent)
+        self.labels[mask] = sub_labels[mask] + (first - 1)
+        self._parent = parent.tolist() + list(range(first, first + count))
+        self._dirty.clear()
+
+    def component(self, pos):
+        """Component id of the cell at pos, or 0 if it is blocked or out of bounds."""
+        row, col = pos
+        if not self.grid.in_bounds(row, col) or not self.labels[row, col]:
+            return 0
+        if self._dirty:
+            self._relabel_dirty()
+        return self.find(int(self.labels[row, col]))
+
+    def connected(self, a, b):
+        component = self.component(a)
+        return component != 0 and component == self.component(b)
+
+    def reachable(self, start, exits):
+        """True if any exit can be reached from start."""
+        component = self.component(start)
+        return component != 0 and any(self.component(pos) == component for pos in exits)
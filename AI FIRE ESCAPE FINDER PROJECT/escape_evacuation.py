@@ -0,0 +1,287 @@
+"""Evacuation of many occupants at once, with per-cell capacity.
+
+Every occupant walks down the same ExitField (one BFS from all exits), so
+routing thousands of people costs one distance field instead of one search
+each. The simulation advances in ticks; in each tick every occupant tries to
+step to a neighbouring cell one step closer to an exit, preferring the least
+crowded one. A cell holds at most ``capacity`` occupants and an exit lets
+``exit_capacity`` of them out per tick, so crowds queue at doors and
+corridors. The cells where occupants were most often turned away are the
+bottlenecks.
+
+    python escape_evacuation.py --rows 1000 --cols 1000 --occupants 10000 --exits 8
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from escape_fields import exit_field
+from escape_grid import FloorGrid
+
+DEFAULT_OCCUPANTS = 200
+DEFAULT_CAPACITY = 1 # Occupants per cell
+MAX_PRIORITY = 1024 # Random priorities per tick are drawn from range(MAX_PRIORITY)
+
+
+def place_occupants(passable, exits, count, capacity=DEFAULT_CAPACITY, rng=None):
+    """(count, 2) array of random (row, col) positions on passable non-exit cells, at most capacity per cell."""
+    rng = np.random.default_rng(rng)
+    free = np.array(passable, dtype=bool)
+    rows, cols = free.shape
+    for row, col in exits:
+        if 0 <= row < rows and 0 <= col < cols:
+            free[row, col] = False
+    slots = np.repeat(np.flatnonzero(free), capacity)
+    if count > len(slots):
+        raise ValueError(f"Cannot place {count} occupants: the floor only has room for {len(slots)}")
+    chosen = rng.choice(slots, count, replace=False)
+    return np.stack(np.divmod(chosen, cols), axis=-1)
+
+
+class EvacuationResult:
+    """Outcome of an evacuation: when each occupant got out and where they were held up."""
+
+    def __init__(self, exit_times, blocked):
+        self.exit_times = exit_times # int32 per occupant: tick it left through an exit, -1 if trapped
+        self.blocked = blocked       # (rows, cols) int64: occupant-ticks spent waiting to enter each cell
+
+    @property
+    def evacuated(self):
+        return int((self.exit_times >= 0).sum())
+
+    @property
+    def trapped(self):
+        return len(self.exit_times) - self.evacuated
+
+    @property
+    def evacuation_time(self):
+        """Ticks until the last occupant who can get out is out."""
+        return int(self.exit_times.max()) if self.evacuated else 0
+
+    def bottlenecks(self, count=5):
+        """[((row, col), waits)] for the count cells with the most waiting, busiest first."""
+        flat = self.blocked.ravel()
+        busiest = np.argsort(flat, kind="stable")[::-1][:count]
+        busiest = busiest[flat[busiest] > 0]
+        cols = self.blocked.shape[1]
+        return [((int(i // cols), int(i % cols)), int(flat[i])) for i in busiest]
+
+    def __repr__(self):
+        return (f"EvacuationResult(evacuated={self.evacuated}, trapped={self.trapped}, "
+                f"evacuation_time={self.evacuation_time})")
+
+
+class EvacuationSimulation:
+    """Tick-by-tick evacuation of occupants from a layout.
+
+    Moves are resolved for all occupants at once with NumPy. Occupants who
+    want the same cell are ranked in a random order that is redrawn every
+    tick; the first ones take the free places in the cell, and each further
+    one waits on a particular occupant of that cell and follows if that
+    occupant moves on. Steps always lead closer to an exit, so these chains
+    end and are resolved by pointer jumping in O(log length) rounds; a whole
+    queue moves up in the same tick. With capacity above 1 the place left by
+    an occupant only goes to the one paired with it, so a place can stay
+    empty for a tick. Occupants who cannot reach an exit are trapped and do
+    not move.
+
+    Call step() for one tick (the GUI animates this) or run() to finish.
+    """
+
+    def __init__(self, passable, exits, occupants, capacity=DEFAULT_CAPACITY, exit_capacity=None, rng=None):
+        self.field = exit_field(passable, exits)
+        grid = self.grid = self.field.grid
+        self.capacity = capacity
+        self.exit_capacity = capacity if exit_capacity is None else exit_capacity
+        self.rng = np.random.default_rng(rng)
+        self.distance = grid.pad(self.field.distance(), -1)
+        self.offsets = np.array(grid.offsets, dtype=np.int64)
+
+        occupants = np.asarray(occupants, dtype=np.int64).reshape(-1, 2)
+        rows, cols = occupants[:, 0], occupants[:, 1]
+        inside = (rows >= 0) & (rows < grid.rows) & (cols >= 0) & (cols < grid.cols)
+        self.position = (rows + 1) * grid.width + cols + 1
+        if not inside.all() or not np.frombuffer(grid.passable, dtype=np.uint8)[self.position].all():
+            raise ValueError("Occupants must stand on passable cells inside the grid")
+        self.occupancy = np.bincount(self.position, minlength=grid.size)
+        if self.occupancy.max(initial=0) > capacity:
+            raise ValueError(f"More than {capacity} occupants share a cell")
+
+        self.exit_times = np.full(len(self.position), -1, dtype=np.int32)
+        self.active = np.flatnonzero(self.distance[self.position] >= 0) # Occupants still inside, able to leave
+        self.blocked = np.zeros(grid.size, dtype=np.int64)
+        self._first_occupant = np.zeros(grid.size, dtype=np.int64) # Scratch: cell -> its first slot in by_cell
+        self.tick = 0
+        self.result = None
+        if not len(self.active):
+            self.finish()
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def occupied(self):
+        """[(row, col)] of the cells with someone still inside (trapped occupants included)."""
+        return self._cells(np.flatnonzero(self.occupancy))
+
+    def _cells(self, indices):
+        rows, cols = np.divmod(indices, self.grid.width)
+        return list(zip((rows - 1).tolist(), (cols - 1).tolist()))
+
+    def _sort_groups(self, groups, priority):
+        """Sorts items by group, then priority, with one np.sort of packed integer keys.
+
+        Returns (order, sorted_groups, ranks): the item indices in sorted
+        order, their groups, and each item's rank within its group.
+        """
+        count = len(groups)
+        ties = max(1, min(MAX_PRIORITY, 2**62 // (self.grid.size * max(count, 1)))) # Keys must fit in int64
+        keys = np.sort((groups * ties + priority % ties) * count + np.arange(count))
+        order = keys % count
+        sorted_groups = keys // (ties * count)
+        first = np.ones(count, dtype=bool)
+        np.not_equal(sorted_groups[1:], sorted_groups[:-1], out=first[1:])
+        indices = np.arange(count)
+        ranks = np.empty(count, dtype=np.int64)
+        ranks[order] = indices - np.maximum.accumulate(np.where(first, indices, 0))
+        return order, sorted_groups, ranks
+
+    @staticmethod
+    def _distinct(indices):
+        indices = np.sort(indices)
+        return indices[np.concatenate(([True], indices[1:] != indices[:-1]))] if len(indices) else indices
+
+    def step(self):
+        """Advances one tick; returns (vacated, entered): [(row, col)] of cells that emptied or filled."""
+        vacated, entered = self._advance()
+        return self._cells(vacated), self._cells(entered)
+
+    def _advance(self):
+        """One tick; returns the flat indices of the cells that emptied and filled."""
+        if self.done:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self.tick += 1
+        agents = self.active
+        position = self.position[agents]
+        distance = self.distance[position]
+        occupancy = self.occupancy
+        priority = self.rng.integers(0, MAX_PRIORITY, len(agents))
+
+        # Occupants of each cell in priority order (who waits on whom)
+        by_cell, cell_of, cell_rank = self._sort_groups(position, priority)
+        firsts = np.flatnonzero(cell_rank[by_cell] == 0)
+        self._first_occupant[cell_of[firsts]] = firsts
+        state = np.full(len(agents), -1, dtype=np.int8) # 1 moves, 0 stays, -1 waits on dep
+        dep = np.full(len(agents), -1, dtype=np.int64)
+
+        # On an exit: the first exit_capacity occupants of the cell leave
+        at_exit = distance == 0
+        state[at_exit] = cell_rank[at_exit] < self.exit_capacity
+
+        # Elsewhere: step to the least crowded neighbour one step closer to an exit
+        walkers = np.flatnonzero(~at_exit)
+        candidates = position[walkers, None] + self.offsets
+        downhill = self.distance[candidates] == (distance[walkers] - 1)[:, None]
+        load = occupancy[candidates] + ~downhill * (self.capacity + 1)
+        choice = (load * 4 + self.rng.integers(0, 4, candidates.shape, dtype=np.uint8)).argmin(axis=1) # Random tie-break
+        target = candidates[np.arange(len(walkers)), choice]
+
+        rank = self._sort_groups(target, priority[walkers])[2]
+        free = self.capacity - occupancy[target]
+        waiting = rank - free # Index of the occupant of the target this walker waits on
+        state[walkers] = rank < free
+        follows = (waiting >= 0) & (waiting < occupancy[target])
+        dep[walkers[follows]] = by_cell[self._first_occupant[target[follows]] + waiting[follows]]
+        state[walkers[follows]] = -1
+
+        # Pointer jumping along the waiting chains
+        pending = np.flatnonzero(state == -1)
+        while len(pending):
+            ahead = dep[pending]
+            resolved = state[ahead] != -1
+            state[pending[resolved]] = state[ahead[resolved]]
+            pending = pending[~resolved]
+            dep[pending] = dep[dep[pending]]
+
+        moves = state[walkers] == 1
+        leaving = at_exit & (state == 1)
+        np.add.at(self.blocked, target[~moves], 1)
+        np.add.at(self.blocked, position[at_exit & ~leaving], 1) # Queueing to get out
+        movers, destination = walkers[moves], target[moves]
+        entered = destination[occupancy[destination] == 0]
+
+        left_from = position[state == 1]
+        np.subtract.at(occupancy, left_from, 1)
+        np.add.at(occupancy, destination, 1)
+        self.position[agents[movers]] = destination
+        self.exit_times[agents[leaving]] = self.tick
+        self.active = agents[~leaving]
+
+        if not len(self.active):
+            self.finish()
+        return self._distinct(left_from[occupancy[left_from] == 0]), self._distinct(entered)
+
+    def finish(self):
+        self.result = EvacuationResult(self.exit_times, self.grid.unpad(self.blocked))
+
+    def run(self, max_ticks=None):
+        """Steps until everyone who can get out is out (or max_ticks); returns the EvacuationResult."""
+        while not self.done and (max_ticks is None or self.tick < max_ticks):
+            self._advance()
+        if not self.done:
+            self.finish()
+        return self.result
+
+
+def evacuate(passable, exits, occupants, capacity=DEFAULT_CAPACITY, exit_capacity=None, rng=None, max_ticks=None):
+    """Runs a complete evacuation and returns its EvacuationResult."""
+    return EvacuationSimulation(passable, exits, occupants, capacity, exit_capacity, rng).run(max_ticks)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="escape_evacuation", description="Evacuate a random floor layout")
+    parser.add_argument("--rows", type=int, default=200, help="Grid rows (default: 200)")
+    parser.add_argument("--cols", type=int, default=200, help="Grid columns (default: 200)")
+    parser.add_argument("--walls", type=float, default=0.20, help="Wall density (default: 0.20)")
+    parser.add_argument("--fires", type=float, default=0.05, help="Fire density (default: 0.05)")
+    parser.add_argument("--exits", type=int, default=4, help="Exits (default: 4)")
+    parser.add_argument("--occupants", type=int, default=DEFAULT_OCCUPANTS,
+                        help=f"Occupants (default: {DEFAULT_OCCUPANTS})")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help=f"Occupants per cell (default: {DEFAULT_CAPACITY})")
+    parser.add_argument("--exit-capacity", type=int, default=None,
+                        help="Occupants leaving through each exit per tick (default: --capacity)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.rows < 1 or args.cols < 1 or args.capacity < 1:
+        print("--rows, --cols and --capacity must be at least 1", file=sys.stderr)
+        return 2
+
+    rng = np.random.default_rng(args.seed)
+    grid = FloorGrid(args.rows, args.cols)
+    grid.randomize(args.walls, args.fires, rng=rng, exit_count=args.exits)
+    passable = grid.passable_mask()
+    try:
+        occupants = place_occupants(passable, grid.exits, args.occupants, args.capacity, rng)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    result = evacuate(passable, grid.exits, occupants, args.capacity, args.exit_capacity, rng)
+    elapsed = time.perf_counter() - started
+    print(f"{result.evacuated} evacuated in {result.evacuation_time} ticks, {result.trapped} trapped "
+          f"({elapsed:.2f}s)")
+    for (row, col), waits in result.bottlenecks():
+        print(f"  bottleneck ({row}, {col}): {waits} waits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import numpy as np
+
+from escape_grid import FlatGrid
+
+
+class ExitField:
+    """Distance to the nearest exit and the next step towards it, for every cell.
+
+    Built by one breadth-first search that starts from all exits at once and
+    grows outwards one wave (one step of distance) at a time; each wave is a
+    handful of NumPy operations on the frontier. After that, the escape route
+    from any cell is a walk along ``next_hop``, O(path length).
+
+    Call expand_wave() to grow the field one wave at a time (the GUI animates
+    this), or build() to finish it.
+    """
+
+    def __init__(self, passable, exits):
+        self.grid = FlatGrid(passable)
+        self.rows, self.cols = self.grid.rows, self.grid.cols
+        self._passable = np.frombuffer(self.grid.passable, dtype=np.uint8).astype(bool)
+        self._offsets = np.array(self.grid.offsets, dtype=np.int64)
+        self._distance = np.full(self.grid.size, -1, dtype=np.int32)
+        self._next_hop = np.full(self.grid.size, -1, dtype=np.int64)
+
+        starts = [self.grid.index(pos) for pos in exits if self.grid.is_passable(pos)]
+        self.frontier = np.unique(np.array(starts, dtype=np.int64))
+        self._distance[self.frontier] = 0
+        self.wave = 0
+        self.reached = len(self.frontier) # Cells with a known distance
+
+    @property
+    def complete(self):
+        return len(self.frontier) == 0
+
+    def expand_wave(self):
+        """Labels every cell one step further out; returns their flat padded indices."""
+        if self.complete:
+            return self.frontier
+        candidates = (self.frontier[:, None] + self._offsets).ravel()
+        sources = np.repeat(self.frontier, len(self._offsets))
+        new = self._passable[candidates] & (self._distance[candidates] == -1)
+        candidates, sources = candidates[new], sources[new]
+        candidates, first = np.unique(candidates, return_index=True)
+
+        self.wave += 1
+        self._distance[candidates] = self.wave
+        self._next_hop[candidates] = sources[first]
+        self.frontier = candidates
+        self.reached += len(candidates)
+        return candidates
+
+    def build(self):
+        while not self.complete:
+            self.expand_wave()
+        return self
+
+    # --- Lookups ---
+    def distance(self):
+        """(rows, cols) int32 array of steps to the nearest exit, -1 where no exit is reachable."""
+        return self.grid.unpad(self._distance)
+
+    def next_hop(self):
+        """(rows, cols, 2) array of the next (row, col) towards an exit, -1 at exits and unreachable cells."""
+        hops = self.grid.unpad(self._next_hop)
+        rows, cols = np.divmod(hops, self.grid.width)
+        out = np.stack([rows - 1, cols - 1], axis=-1)
+        out[hops == -1] = -1
+        return out
+
+    def distance_to_exit(self, pos):
+        """Steps from pos to the nearest exit, or None if none is reachable (or not labelled yet)."""
+        if not self.grid.is_passable(pos):
+            return None
+        distance = int(self._distance[self.grid.index(pos)])
+        return distance if distance >= 0 else None
+
+    def route(self, start):
+        """[(row, col), ...] from start to its nearest exit, [] if none is reachable."""
+        if self.distance_to_exit(start) is None:
+            return []
+        grid, next_hop = self.grid, self._next_hop
+        index = grid.index(start)
+        path = [start]
+        while next_hop[index] != -1:
+            index = int(next_hop[index])
+            path.append(grid.pos(index))
+        return path
+
+    def routes(self, starts):
+        return [self.route(start) for start in starts]
+
+
+def exit_field(passable, exits):
+    """Builds the complete ExitField for a layout."""
+    return ExitField(passable, exits).build()
@@ -0,0 +1,119 @@
+"""Fire spread over discrete ticks, and escape routes that stay ahead of it.
+
+Each tick, a cell that is not a wall catches fire with probability
+1 - (1 - p) ** k, where k is how many of its four neighbours are burning.
+The simulation runs a batch of independent runs (seeds) at once: the state
+is a (runs, rows, cols) array and every tick is a few whole-array NumPy
+operations, so long simulations on big floors stay fast.
+
+The result is the tick each cell catches fire (its fire arrival time). An
+escape route is only valid if the occupant, moving one cell per tick,
+enters every cell before the fire does; escape_solver's A* plans against
+exactly that when given ``fire_time``.
+"""
+import numpy as np
+
+from escape_grid import CELL_FIRE, CELL_WALL
+from escape_solver import find_path
+
+NEVER = np.iinfo(np.int32).max # Arrival time of cells the fire never reaches
+DEFAULT_SPREAD_PROBABILITY = 0.3
+
+
+class FireSpread:
+    """Fire state of one floor plan for a batch of independent runs.
+
+    Fire starts on the CELL_FIRE cells, never enters walls, and keeps
+    burning once lit. ``arrival`` holds the tick each cell caught fire
+    (0 for the initial fire, NEVER if it has not burned).
+    """
+
+    def __init__(self, cells, spread_probability=DEFAULT_SPREAD_PROBABILITY, runs=1, rng=None):
+        if not 0 <= spread_probability <= 1:
+            raise ValueError(f"spread_probability must be between 0 and 1, got {spread_probability}")
+        cells = np.asarray(cells)
+        self.spread_probability = spread_probability
+        self.rng = np.random.default_rng(rng)
+        self.tick = 0
+        self.active = spread_probability > 0 # False once the fire cannot spread any further
+
+        # Burning state (1 = burning) with a never-burning border, so the
+        # neighbour counts are sums of four shifted views
+        rows, cols = cells.shape
+        self._padded = np.zeros((runs, rows + 2, cols + 2), dtype=np.uint8)
+        self._padded[:, 1:-1, 1:-1] = cells == CELL_FIRE
+        self._unburnt = np.repeat(((cells != CELL_WALL) & (cells != CELL_FIRE))[None], runs, axis=0)
+        self.arrival = np.where(self.burning, 0, NEVER).astype(np.int32)
+
+        # Chance of catching fire with 0-4 burning neighbours
+        self._ignite_chance = 1 - (1 - spread_probability) ** np.arange(5)
+
+    @property
+    def runs(self):
+        return self._padded.shape[0]
+
+    @property
+    def burning(self):
+        """(runs, rows, cols) boolean array of burning cells."""
+        return self._padded[:, 1:-1, 1:-1].astype(bool)
+
+    def burning_neighbors(self):
+        """(runs, rows, cols) count of burning 4-neighbours of every cell."""
+        padded = self._padded
+        return padded[:, :-2, 1:-1] + padded[:, 2:, 1:-1] + padded[:, 1:-1, :-2] + padded[:, 1:-1, 2:]
+
+    def step(self):
+        """Advances the fire one tick; returns the flat indices (into ``arrival``) of the cells that caught fire."""
+        neighbors = self.burning_neighbors()
+        at_risk = np.flatnonzero(self._unburnt & (neighbors > 0))
+        self.tick += 1
+        self.active = self.spread_probability > 0 and len(at_risk) > 0
+        if self.spread_probability >= 1:
+            ignite = at_risk
+        else:
+            # Only draw random numbers for cells next to the fire
+            chance = self._ignite_chance[neighbors.ravel()[at_risk]]
+            ignite = at_risk[self.rng.random(len(at_risk)) < chance]
+
+        runs, rows, cols = self.arrival.shape
+        run, rest = np.divmod(ignite, rows * cols)
+        row, col = np.divmod(rest, cols)
+        self._padded.ravel()[(run * (rows + 2) + row + 1) * (cols + 2) + col + 1] = 1
+        self._unburnt.ravel()[ignite] = False
+        self.arrival.ravel()[ignite] = self.tick
+        return ignite
+
+    def run(self, max_ticks=None):
+        """Steps until the fire stops spreading (or max_ticks); returns ``arrival``."""
+        while self.active and (max_ticks is None or self.tick < max_ticks):
+            self.step()
+        return self.arrival
+
+
+def fire_arrival_times(cells, spread_probability=DEFAULT_SPREAD_PROBABILITY, runs=1, rng=None,
+                       max_ticks=None):
+    """(runs, rows, cols) int32 array of the tick each cell catches fire, NEVER if it does not."""
+    return FireSpread(cells, spread_probability, runs, rng).run(max_ticks)
+
+
+def escape_trials(grid, runs, spread_probability=DEFAULT_SPREAD_PROBABILITY, rng=None, max_ticks=None,
+                  batch_size=16):
+    """Simulates the fire `runs` times on a FloorGrid and plans an escape against each run.
+
+    Runs are simulated batch_size at a time. Returns one SearchResult per
+    run; ``result.found`` is False when the fire cuts off every exit.
+    """
+    rng = np.random.default_rng(rng)
+    passable = grid.passable_mask()
+    results = []
+    while len(results) < runs:
+        arrivals = fire_arrival_times(grid.cells, spread_probability, min(batch_size, runs - len(results)),
+                                      rng, max_ticks)
+        for fire_time in arrivals:
+            results.append(find_path(passable, grid.start, grid.exits, fire_time=fire_time))
+    return results
+
+
+def survival_rate(results):
+    """Fraction of escape_trials() runs with a safe route."""
+    return sum(result.found for result in results) / len(results) if results else 0.0
@@ -0,0 +1,200 @@
+from collections import deque
+
+import numpy as np
+
+# Cell types
+CELL_EMPTY = 0
+CELL_WALL = 1
+CELL_FIRE = 2
+CELL_START = 3
+CELL_END = 4
+CELL_PATH = 5
+CELL_VISITED = 6 # New cell type for animation
+CELL_SMOKE = 7   # Terrain: passable, but slow (see escape_terrain.py)
+CELL_STAIRS = 8
+CELL_DOOR = 9
+CELL_OCCUPANT = 10 # Display only: occupants in the evacuation animation (see escape_evacuation.py)
+
+OBSTACLES = (CELL_WALL, CELL_FIRE)
+
+DEFAULT_ROWS = 20
+DEFAULT_COLS = 20
+MAX_LOGGED_CHANGES = 10000 # Cell edits remembered for changes_since()
+
+
+class FloorGrid:
+    """Floor plan stored as one contiguous uint8 array of cell types.
+
+    A 2000x2000 floor takes 4 MB. Bulk operations (clearing, randomizing,
+    obstacle masks) are vectorized; single-cell edits go through paint(),
+    which keeps the start unique. A floor can have any number of exits.
+
+    ``version`` goes up with every edit made through this class. paint()
+    also logs the edited cells, so changes_since() can tell what happened
+    between two versions. Writing to ``cells`` directly (as the GUI does for
+    path and visited markings) is not tracked.
+    """
+
+    def __init__(self, rows=DEFAULT_ROWS, cols=DEFAULT_COLS):
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Grid must be at least 1x1, got {rows}x{cols}")
+        self.cells = np.zeros((rows, cols), dtype=np.uint8)
+        self.start = None
+        self.exits = [] # (row, col) of every exit, in the order they were placed
+        self.version = 0
+        self._changes = deque(maxlen=MAX_LOGGED_CHANGES) # (version, row, col, previous cell type)
+        self._changes_base = 0 # Oldest version changes_since() can answer for
+
+    @property
+    def rows(self):
+        return self.cells.shape[0]
+
+    @property
+    def cols(self):
+        return self.cells.shape[1]
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    def __getitem__(self, pos):
+        return int(self.cells[pos])
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    # --- Masks ---
+    def obstacle_mask(self):
+        """Boolean array, True where a cell cannot be entered (walls and fire)."""
+        return (self.cells == CELL_WALL) | (self.cells == CELL_FIRE)
+
+    def passable_mask(self):
+        """Boolean array, True where a cell can be entered; this is what the solvers read."""
+        return ~self.obstacle_mask()
+
+    # --- Editing ---
+    def paint(self, row, col, cell_type):
+        """Sets one cell and returns the [(row, col)] cells that changed.
+
+        Placing a start moves the previous one; placing an exit adds one.
+        Walls and fire never overwrite the start or an exit.
+        """
+        current = self.cells[row, col]
+        if current == cell_type or (current in (CELL_START, CELL_END) and cell_type in OBSTACLES):
+            return []
+
+        changed = [(row, col)]
+        pos = (row, col)
+        if cell_type == CELL_START and self.start not in (None, pos):
+            changed.append(self.start)
+        self.version += 1
+        for r, c in changed:
+            if len(self._changes) == self._changes.maxlen:
+                self._changes_base = self._changes[0][0]
+            self._changes.append((self.version, r, c, int(self.cells[r, c])))
+
+        if len(changed) > 1:
+            self.cells[self.start] = CELL_EMPTY # Remove old start
+
+        # Overwriting the start or an exit removes it
+        if pos == self.start and cell_type != CELL_START:
+            self.start = None
+        if current == CELL_END and cell_type != CELL_END:
+            self.exits.remove(pos)
+        if cell_type == CELL_START:
+            self.start = pos
+        elif cell_type == CELL_END and current != CELL_END:
+            self.exits.append(pos)
+
+        self.cells[row, col] = cell_type
+        return changed
+
+    def changes_since(self, version):
+        """{(row, col): cell type at that version} for every cell painted since version.
+
+        Returns None if that is unknown (version too old, or a bulk edit
+        such as clear() or randomize() happened since).
+        """
+        if version < self._changes_base or version > self.version:
+            return None
+        previous = {}
+        for change_version, row, col, old_type in reversed(self._changes):
+            if change_version <= version:
+                break
+            previous[(row, col)] = old_type # Oldest change wins
+        return previous
+
+    def _bulk_edit(self):
+        self.version += 1
+        self._changes.clear()
+        self._changes_base = self.version
+
+    def clear(self):
+        """Resets every cell to empty."""
+        self.cells.fill(CELL_EMPTY)
+        self.start = None
+        self.exits = []
+        self._bulk_edit()
+
+    def clear_path(self):
+        """Removes the path and visited-cell markings."""
+        self.cells[(self.cells == CELL_PATH) | (self.cells == CELL_VISITED)] = CELL_EMPTY
+
+    def randomize(self, wall_percent=0.20, fire_percent=0.05, rng=None, exit_count=1):
+        """Fills the grid with random walls and fire, then places a start and exit_count exits.
+
+        rng can be a seed or a numpy Generator.
+        """
+        rng = np.random.default_rng(rng)
+        rand = rng.random(self.shape)
+        self.cells[...] = CELL_EMPTY
+        self.cells[rand < fire_percent + wall_percent] = CELL_WALL
+        self.cells[rand < fire_percent] = CELL_FIRE
+
+        # Start and exits on different cells (as many exits as fit)
+        picks = rng.choice(self.cells.size, size=min(1 + exit_count, self.cells.size), replace=False)
+        positions = [tuple(int(i) for i in np.unravel_index(p, self.shape)) for p in picks]
+        self.start = positions[0]
+        self.exits = positions[1:]
+        self.cells[self.start] = CELL_START
+        for pos in self.exits:
+            self.cells[pos] = CELL_END
+        self._bulk_edit()
+
+
+class FlatGrid:
+    """Passability mask flattened with a one-cell blocked border.
+
+    Cell (row, col) is index (row + 1) * width + col + 1, and its neighbours
+    are index -width, +width, -1 and +1, so the search loops need no bounds
+    checks. ``passable`` is a bytes object (1 = passable) for fast indexing.
+    """
+
+    def __init__(self, passable):
+        self.rows, self.cols = passable.shape
+        self.width = self.cols + 2
+        padded = np.zeros((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = passable
+        self.passable = padded.tobytes()
+        self.size = len(self.passable)
+        self.offsets = (-self.width, self.width, -1, 1) # Up, Down, Left, Right
+
+    def index(self, pos):
+        return (pos[0] + 1) * self.width + pos[1] + 1
+
+    def pos(self, index):
+        row, col = divmod(index, self.width)
+        return (row - 1, col - 1)
+
+    def is_passable(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols and self.passable[self.index(pos)] == 1
+
+    def pad(self, values, fill=0):
+        """Flattens a (rows, cols) array to per-index values, with fill on the border."""
+        padded = np.full((self.rows + 2, self.width), fill, dtype=np.asarray(values).dtype)
+        padded[1:-1, 1:-1] = values
+        return padded.ravel()
+
+    def unpad(self, values):
+        """Reshapes a flat per-index array to (rows, cols), dropping the border."""
+        return values.reshape(self.rows + 2, self.width)[1:-1, 1:-1]
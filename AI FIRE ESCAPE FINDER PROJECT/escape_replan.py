@@ -0,0 +1,173 @@
+"""Incremental replanning with D* Lite for live edits.
+
+A fresh A* throws away all its work whenever a wall or fire cell is
+painted. D* Lite keeps its search tree between edits and only repairs the
+part an edit affects, so the route can be refreshed after every cell of a
+drag-paint.
+
+The search runs backwards, from all exits at once towards the start, so
+g[cell] is the distance from that cell to the nearest exit. Moving the start
+is cheap too: the heuristic changes and the key modifier ``km`` keeps the
+queued keys valid (Koenig & Likhachev, "D* Lite", 2002).
+"""
+import heapq
+from array import array
+
+from escape_grid import FlatGrid, OBSTACLES
+from escape_solver import UNREACHED, SearchResult
+
+
+class DStarLite:
+    """Shortest escape route on a FloorGrid, kept up to date as the grid is edited.
+
+    Call update(changed_cells) after painting cells (FloorGrid.paint()
+    returns them), then plan() for the current route. After bulk edits
+    (clear, randomize) create a new planner. ``expanded`` counts the nodes
+    expanded by the latest plan() call.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.flat = FlatGrid(grid.passable_mask())
+        self.passable = bytearray(self.flat.passable)
+        size = self.flat.size
+        self.g = array('i', [UNREACHED]) * size
+        self.rhs = array('i', [UNREACHED]) * size
+        self.queued = {} # Index -> its current key in the queue (other heap entries are stale)
+        self.queue = []
+        self.km = 0
+        self.expanded = 0
+
+        self.start = grid.start
+        self.last_start = grid.start # Start the queued keys were computed for
+        self.exits = set()
+        self._sync_exits()
+
+    # --- Keys ---
+    def heuristic(self, index):
+        if self.start is None:
+            return 0
+        row, col = self.flat.pos(index)
+        return abs(row - self.start[0]) + abs(col - self.start[1])
+
+    def key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        if best == UNREACHED:
+            return (UNREACHED, UNREACHED)
+        return (best + self.heuristic(index) + self.km, best)
+
+    # --- Updates ---
+    def update_vertex(self, index):
+        """Recomputes rhs for one cell and (re)queues it if it is inconsistent."""
+        if index not in self.exits:
+            best = UNREACHED
+            if self.passable[index]:
+                g = self.g
+                for offset in self.flat.offsets:
+                    neighbor = index + offset
+                    if self.passable[neighbor] and g[neighbor] + 1 < best:
+                        best = g[neighbor] + 1
+            self.rhs[index] = best
+        if self.g[index] != self.rhs[index]:
+            key = self.key(index)
+            self.queued[index] = key
+            heapq.heappush(self.queue, (key, index))
+        else:
+            self.queued.pop(index, None)
+
+    def _sync_exits(self):
+        exits = {self.flat.index(pos) for pos in self.grid.exits}
+        changed = exits ^ self.exits
+        self.exits = exits
+        for index in changed:
+            if index in exits:
+                self.rhs[index] = 0
+            self.update_vertex(index)
+
+    def _sync_start(self):
+        start = self.grid.start
+        if start == self.start:
+            return
+        self.start = start
+        if start is not None:
+            if self.last_start is not None:
+                self.km += abs(start[0] - self.last_start[0]) + abs(start[1] - self.last_start[1])
+            self.last_start = start
+
+    def update(self, cells):
+        """Takes in the given [(row, col)] cells after they were edited on the grid."""
+        self._sync_start()
+        grid_cells, flat = self.grid.cells, self.flat
+        for row, col in cells:
+            index = flat.index((row, col))
+            passable = grid_cells[row, col] not in OBSTACLES
+            if passable == bool(self.passable[index]):
+                continue
+            self.passable[index] = passable
+            self.update_vertex(index)
+            for offset in flat.offsets:
+                self.update_vertex(index + offset)
+        self._sync_exits()
+
+    # --- Search ---
+    def compute_shortest_path(self):
+        queue, queued, g, rhs = self.queue, self.queued, self.g, self.rhs
+        start = self.flat.index(self.start)
+        offsets, passable = self.flat.offsets, self.passable
+        expanded = 0
+        while queue:
+            key, index = queue[0]
+            if queued.get(index) != key:
+                heapq.heappop(queue) # Stale entry
+                continue
+            if key >= self.key(start) and rhs[start] == g[start]:
+                break
+            heapq.heappop(queue)
+            del queued[index]
+            expanded += 1
+
+            new_key = self.key(index)
+            if key < new_key:
+                queued[index] = new_key
+                heapq.heappush(queue, (new_key, index))
+            elif g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for offset in offsets:
+                    neighbor = index + offset
+                    if passable[neighbor] and neighbor not in self.exits and g[index] + 1 < rhs[neighbor]:
+                        rhs[neighbor] = g[index] + 1
+                        if g[neighbor] != rhs[neighbor]:
+                            neighbor_key = self.key(neighbor)
+                            queued[neighbor] = neighbor_key
+                            heapq.heappush(queue, (neighbor_key, neighbor))
+                        else:
+                            queued.pop(neighbor, None)
+            else:
+                g[index] = UNREACHED
+                self.update_vertex(index)
+                for offset in offsets:
+                    self.update_vertex(index + offset)
+        return expanded
+
+    def plan(self):
+        """Brings the search up to date and returns the current route as a SearchResult."""
+        self._sync_start()
+        self._sync_exits()
+        if self.start is None or not self.exits:
+            self.expanded = 0
+            return SearchResult([], 0, 0)
+        self.expanded = self.compute_shortest_path()
+        return SearchResult(self.route(), self.expanded, self.expanded)
+
+    def route(self):
+        """[(row, col), ...] from the start downhill in g to an exit, [] if none is reachable."""
+        flat, g = self.flat, self.g
+        index = flat.index(self.start)
+        if not self.passable[index] or g[index] == UNREACHED:
+            return []
+        path = [self.start]
+        while index not in self.exits:
+            index = min((index + offset for offset in flat.offsets if self.passable[index + offset]),
+                        key=g.__getitem__)
+            path.append(flat.pos(index))
+        return path
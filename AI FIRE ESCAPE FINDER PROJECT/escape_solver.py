@@ -0,0 +1,879 @@
+"""Headless escape path search for the Fire Escape Finder.
+
+The solvers read a boolean passability mask (``FloorGrid.passable_mask()``,
+True where a cell can be entered) and never touch Tk; the weighted solvers
+read per-cell movement costs instead (``escape_terrain.cost_map()``). Every
+search runs from a start cell to the nearest of a list of exits. A search
+can be run to the end in one call (``find_path``) or advanced one expansion
+at a time with ``step()``, which is how the GUI animates it.
+"""
+import heapq
+from array import array
+
+import numpy as np
+
+from escape_fields import ExitField
+from escape_grid import FlatGrid
+from escape_terrain import STEP_COST
+
+# (Up, Down, Left, Right), the same order as FlatGrid.offsets
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+UNREACHED = 2 ** 31 - 1
+
+
+def manhattan(pos1, pos2):
+    """Calculates the Manhattan distance heuristic for A*."""
+    r1, c1 = pos1
+    r2, c2 = pos2
+    return abs(r1 - r2) + abs(c1 - c2)
+
+
+class SearchResult:
+    """Outcome of a finished search."""
+
+    def __init__(self, path, expanded, opened, path_cost=None):
+        self.path = path          # [(row, col), ...] from start to exit, [] if there is none
+        self.expanded = expanded  # Nodes taken off the open set
+        self.opened = opened      # Nodes added to the open set
+        self.path_cost = path_cost # Total movement cost, for weighted searches
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    @property
+    def cost(self):
+        """Number of moves along the path, or None if no path exists."""
+        return len(self.path) - 1 if self.path else None
+
+    def __repr__(self):
+        return f"SearchResult(cost={self.cost}, expanded={self.expanded}, opened={self.opened})"
+
+
+class AStarSearch:
+    """A* from start to the nearest exit over the 4-neighbour grid; every move costs 1.
+
+    The open set is a binary heap with lazy deletion: when a node's g-cost
+    improves it is pushed again, and stale entries are skipped when popped
+    because the node is already in the closed set. With the consistent
+    heuristic (Manhattan distance to the closest exit) the first time a node
+    is closed its g-cost is final, so paths are optimal.
+
+    ``fire_time`` (optional, a (rows, cols) array such as one run of
+    escape_fire.fire_arrival_times()) is the tick each cell catches fire. A
+    cell can then only be entered at a time (its g-cost) before that; since
+    arriving earlier is never worse, the path found is still the shortest
+    safe one.
+
+    Call step() to expand one node at a time, or run() to search to the end.
+    Once done, the outcome is in ``result``.
+    """
+    supports_fire_time = True
+    weighted = False
+
+    def __init__(self, passable, start, exits, fire_time=None):
+        self.grid = FlatGrid(passable)
+        self.rows, self.cols = self.grid.rows, self.grid.cols
+        self.start = start
+        self.exits = [pos for pos in exits if self.grid.is_passable(pos)]
+        self.exit_indices = [self.grid.index(pos) for pos in self.exits]
+        self.exit_set = set(self.exit_indices)
+        self.exit_coords = [divmod(i, self.grid.width) for i in self.exit_indices]
+        self.expanded = 0
+        self.opened = 1
+        self.result = None
+
+        size = self.grid.size
+        if fire_time is None:
+            self.g_cost = array('i', [UNREACHED]) * size
+        else:
+            # Seeding g-costs with the fire times makes the usual "is it cheaper"
+            # test also reject cells the fire reaches first
+            padded = self.grid.pad(np.minimum(fire_time, UNREACHED).astype(np.int32), UNREACHED)
+            self.g_cost = array('i', padded.tobytes())
+        self.parent = array('i', [-1]) * size
+        self.closed = bytearray(size)
+
+        if not (self.grid.is_passable(start) and self.exits) or self.g_cost[self.grid.index(start)] <= 0:
+            self.open_set = [] # Nothing to search: the first step reports no path
+            return
+        start_index = self.grid.index(start)
+        self.g_cost[start_index] = 0
+
+        # Items are (f_cost, h_cost, index); h_cost is the tie-breaker
+        h_cost = self.heuristic(start_index)
+        self.open_set = [(h_cost, h_cost, start_index)]
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def heuristic(self, index):
+        """Manhattan distance from a flat index to the closest exit."""
+        r, c = divmod(index, self.grid.width)
+        if len(self.exit_coords) == 1:
+            end_r, end_c = self.exit_coords[0]
+            return abs(r - end_r) + abs(c - end_c)
+        return min(abs(r - end_r) + abs(c - end_c) for end_r, end_c in self.exit_coords)
+
+    def step(self):
+        """Expands the next node and returns the positions it added to the open set."""
+        if self.done:
+            return []
+
+        # Get the open node with the lowest f_cost, skipping stale heap entries
+        open_set, closed = self.open_set, self.closed
+        while open_set and closed[open_set[0][2]]:
+            heapq.heappop(open_set)
+        if not open_set:
+            self.finish([]) # Open set exhausted: no path
+            return []
+
+        current = heapq.heappop(open_set)[2]
+        closed[current] = 1
+        self.expanded += 1
+        if current in self.exit_set:
+            self.finish(self.reconstruct_path(current))
+            return []
+
+        grid, g_cost, parent = self.grid, self.g_cost, self.parent
+        opened = []
+        temp_g_cost = g_cost[current] + 1
+        for offset in grid.offsets:
+            neighbor = current + offset
+            if not grid.passable[neighbor] or closed[neighbor] or temp_g_cost >= g_cost[neighbor]:
+                continue
+            # Better path to the neighbor: record it and push it (again)
+            g_cost[neighbor] = temp_g_cost
+            parent[neighbor] = current
+            h_cost = self.heuristic(neighbor)
+            heapq.heappush(open_set, (temp_g_cost + h_cost, h_cost, neighbor))
+            self.opened += 1
+            opened.append(grid.pos(neighbor))
+        return opened
+
+    def run(self):
+        """Searches to the end and returns the SearchResult."""
+        if self.done:
+            return self.result
+
+        # Same as calling step() until done, with everything in locals
+        heappush, heappop = heapq.heappush, heapq.heappop
+        open_set, closed, g_cost, parent = self.open_set, self.closed, self.g_cost, self.parent
+        passable, offsets, width = self.grid.passable, self.grid.offsets, self.grid.width
+        exit_set, heuristic = self.exit_set, self.heuristic
+        single_exit = len(self.exit_coords) == 1
+        if single_exit:
+            end_r, end_c = self.exit_coords[0]
+        reached = -1
+        expanded = opened = 0
+
+        while open_set:
+            current = heappop(open_set)[2]
+            if closed[current]:
+                continue # Stale entry
+            closed[current] = 1
+            expanded += 1
+            if current in exit_set:
+                reached = current
+                break
+            temp_g_cost = g_cost[current] + 1
+            for offset in offsets:
+                neighbor = current + offset
+                if passable[neighbor] and not closed[neighbor] and temp_g_cost < g_cost[neighbor]:
+                    g_cost[neighbor] = temp_g_cost
+                    parent[neighbor] = current
+                    if single_exit:
+                        r, c = divmod(neighbor, width)
+                        h_cost = abs(r - end_r) + abs(c - end_c)
+                    else:
+                        h_cost = heuristic(neighbor)
+                    heappush(open_set, (temp_g_cost + h_cost, h_cost, neighbor))
+                    opened += 1
+
+        self.expanded += expanded
+        self.opened += opened
+        self.finish(self.reconstruct_path(reached) if reached != -1 else [])
+        return self.result
+
+    def __iter__(self):
+        """Yields the positions opened by each step until the search is done."""
+        while not self.done:
+            yield self.step()
+
+    def reconstruct_path(self, exit_index):
+        path = []
+        curr = exit_index
+        while curr != -1:
+            path.append(self.grid.pos(curr))
+            curr = self.parent[curr]
+        path.reverse()
+        return path
+
+    def finish(self, path):
+        self.result = SearchResult(path, self.expanded, self.opened)
+
+
+def next_after(mask):
+    """For each index i, the smallest j > i where mask[j] is True (len(mask) if none)."""
+    n = len(mask)
+    found = np.where(mask, np.arange(n, dtype=np.int32), np.int32(n))
+    nearest = np.minimum.accumulate(found[::-1])[::-1] # Smallest j >= i
+    result = np.full(n, n, dtype=np.int32)
+    result[:-1] = nearest[1:]
+    return result
+
+
+def last_before(mask):
+    """For each index i, the largest j < i where mask[j] is True (-1 if none)."""
+    n = len(mask)
+    found = np.where(mask, np.arange(n, dtype=np.int32), np.int32(-1))
+    nearest = np.maximum.accumulate(found) # Largest j <= i
+    result = np.full(n, -1, dtype=np.int32)
+    result[1:] = nearest[:-1]
+    return result
+
+
+def to_int_array(values):
+    return array('i', values.astype(np.int32).tobytes())
+
+
+class JumpTable:
+    """Jump targets of every cell in the four directions (JPS+).
+
+    ``east[i]`` is the first jump point reached by moving east from cell i,
+    or -1 if a wall comes first; likewise for the other directions. Exits are
+    not part of the table: jumps that pass an exit (or a cell where a
+    horizontal jump would reach one) are handled by JumpPointSearch.jump().
+    ``row_run``/``col_run`` label the wall-free horizontal/vertical stretches.
+
+    The table only depends on the passable cells, so a caller that searches
+    one layout repeatedly can build it once (JumpTable(FlatGrid(passable)))
+    and hand it to every JumpPointSearch until the layout changes.
+    """
+
+    def __init__(self, grid):
+        width = grid.width
+        passable = np.frombuffer(grid.passable, dtype=np.uint8).reshape(-1, width).astype(bool)
+        height = passable.shape[0]
+
+        def shifted(dr, dc):
+            # shifted(dr, dc)[r, c] == passable[r + dr, c + dc] (False off the edge)
+            out = np.zeros_like(passable)
+            out[max(-dr, 0):height - max(dr, 0), max(-dc, 0):width - max(dc, 0)] = \
+                passable[max(dr, 0):height - max(-dr, 0), max(dc, 0):width - max(-dc, 0)]
+            return out
+
+        up, down, left, right = shifted(-1, 0), shifted(1, 0), shifted(0, -1), shifted(0, 1)
+
+        # Forced neighbours: a side cell opens up where the cell behind it was blocked
+        jp_east = passable & ((up & ~shifted(-1, -1)) | (down & ~shifted(1, -1)))
+        jp_west = passable & ((up & ~shifted(-1, 1)) | (down & ~shifted(1, 1)))
+        jp_south = passable & ((left & ~shifted(-1, -1)) | (right & ~shifted(-1, 1)))
+        jp_north = passable & ((left & ~shifted(1, -1)) | (right & ~shifted(1, 1)))
+
+        # Horizontal jumps run along the row-major layout (border walls end every row)
+        blocked = ~passable.ravel()
+        east = next_after(jp_east.ravel())
+        east[east > next_after(blocked)] = -1
+        west = last_before(jp_west.ravel())
+        west[west < last_before(blocked)] = -1
+        has_horizontal = passable & ((east != -1) | (west != -1)).reshape(passable.shape)
+
+        # A vertical jump also stops where a horizontal jump would find something
+        blocked_t = ~passable.T.ravel()
+        south_t = next_after((jp_south | has_horizontal).T.ravel())
+        south_t[south_t > next_after(blocked_t)] = -1
+        north_t = last_before((jp_north | has_horizontal).T.ravel())
+        north_t[north_t < last_before(blocked_t)] = -1
+
+        def from_column_major(values):
+            # Column-major results (indices and positions) back to row-major
+            values = np.where(values >= 0, (values % height) * width + values // height, -1)
+            return values.reshape(width, height).T.ravel()
+
+        self.east = to_int_array(east)
+        self.west = to_int_array(west)
+        self.south = to_int_array(from_column_major(south_t))
+        self.north = to_int_array(from_column_major(north_t))
+        self.row_run = to_int_array(np.cumsum(blocked))
+        self.col_run = to_int_array(np.cumsum(blocked_t).reshape(width, height).T.ravel())
+
+
+class JumpPointSearch(AStarSearch):
+    """Jump Point Search over the 4-neighbour grid; every move costs 1.
+
+    Straight runs without forced neighbours are skipped in a single jump, so
+    only jump points enter the open set and the same optimal path length as
+    A* comes out with far fewer expansions on open floors. Jump targets are
+    precomputed for the whole grid (JPS+), so each jump is O(1) plus a check
+    per exit. ``result.path`` lists every cell of the path, like the other
+    solvers. Jumps assume every cell stays open, so fire_time is not supported.
+
+    ``jump_table`` is a JumpTable built for the same passable cells; by
+    default one is built for this search.
+    """
+    supports_fire_time = False
+
+    def __init__(self, passable, start, exits, jump_table=None):
+        super().__init__(passable, start, exits)
+        if jump_table is not None and len(jump_table.east) != self.grid.size:
+            raise ValueError("jump_table was built for a grid of a different size")
+        self.jumps = None
+        if self.open_set:
+            self.jumps = jump_table if jump_table is not None else JumpTable(self.grid)
+
+    def jump(self, node, offset):
+        """Returns the first jump point from node in one direction, or -1."""
+        jumps, width = self.jumps, self.grid.width
+        if offset == 1:
+            target = jumps.east[node]
+            for end in self.exit_indices:
+                if end > node and jumps.row_run[end] == jumps.row_run[node] and (target == -1 or end < target):
+                    target = end
+        elif offset == -1:
+            target = jumps.west[node]
+            for end in self.exit_indices:
+                if end < node and jumps.row_run[end] == jumps.row_run[node] and end > target:
+                    target = end
+        else:
+            target = jumps.south[node] if offset == width else jumps.north[node]
+            for end in self.exit_indices:
+                # The cell of this column in the exit's row stops the jump when a
+                # horizontal jump from there would reach the exit
+                cross = end - end % width + node % width
+                if not (self.grid.passable[cross] and jumps.col_run[cross] == jumps.col_run[node]
+                        and jumps.row_run[cross] == jumps.row_run[end]):
+                    continue
+                if offset == width and cross > node and (target == -1 or cross < target):
+                    target = cross
+                elif offset == -width and cross < node and cross > target:
+                    target = cross
+        return target
+
+    def directions(self, node):
+        """Directions worth jumping in: not back towards the parent."""
+        parent = self.parent[node]
+        if parent == -1:
+            return self.grid.offsets
+        width = self.grid.width
+        if node // width == parent // width:
+            forward = 1 if node > parent else -1
+            return (-width, width, forward)
+        forward = width if node > parent else -width
+        return (-1, 1, forward)
+
+    def step(self):
+        """Expands the next jump point and returns the jump points it added to the open set."""
+        if self.done:
+            return []
+
+        open_set, closed = self.open_set, self.closed
+        while open_set and closed[open_set[0][2]]:
+            heapq.heappop(open_set)
+        if not open_set:
+            self.finish([]) # Open set exhausted: no path
+            return []
+
+        current = heapq.heappop(open_set)[2]
+        closed[current] = 1
+        self.expanded += 1
+        if current in self.exit_set:
+            self.finish(self.reconstruct_path(current))
+            return []
+
+        grid, g_cost, parent = self.grid, self.g_cost, self.parent
+        cur_r, cur_c = grid.pos(current)
+        opened = []
+        for offset in self.directions(current):
+            if not grid.passable[current + offset]:
+                continue
+            neighbor = self.jump(current, offset)
+            if neighbor == -1 or closed[neighbor]:
+                continue
+            r, c = grid.pos(neighbor)
+            temp_g_cost = g_cost[current] + abs(r - cur_r) + abs(c - cur_c)
+            if temp_g_cost >= g_cost[neighbor]:
+                continue
+            g_cost[neighbor] = temp_g_cost
+            parent[neighbor] = current
+            h_cost = self.heuristic(neighbor)
+            heapq.heappush(open_set, (temp_g_cost + h_cost, h_cost, neighbor))
+            self.opened += 1
+            opened.append((r, c))
+        return opened
+
+    def run(self):
+        """Searches to the end and returns the SearchResult."""
+        while not self.done:
+            self.step()
+        return self.result
+
+    def reconstruct_path(self, exit_index):
+        """Fills in the straight runs between consecutive jump points."""
+        jump_points = []
+        curr = exit_index
+        while curr != -1:
+            jump_points.append(curr)
+            curr = self.parent[curr]
+        jump_points.reverse()
+
+        width = self.grid.width
+        path = [self.grid.pos(jump_points[0])]
+        for a, b in zip(jump_points, jump_points[1:]):
+            stride = (1 if b > a else -1) if a // width == b // width else (width if b > a else -width)
+            path.extend(self.grid.pos(i) for i in range(a + stride, b + stride, stride))
+        return path
+
+
+class BidirectionalResult(SearchResult):
+    """SearchResult of a BidirectionalSearch, with the work done by each frontier."""
+
+    def __init__(self, path, expanded_forward, expanded_backward, opened):
+        super().__init__(path, expanded_forward + expanded_backward, opened)
+        self.expanded_forward = expanded_forward   # Nodes expanded from the start
+        self.expanded_backward = expanded_backward # Nodes expanded from the exits
+
+    def __repr__(self):
+        return (f"BidirectionalResult(cost={self.cost}, expanded={self.expanded_forward}+{self.expanded_backward}, "
+                f"opened={self.opened})")
+
+
+class BidirectionalSearch:
+    """Level-synchronous breadth-first search from the start and from all exits at once.
+
+    Each step expands one whole level of the smaller frontier. When a level
+    discovers cells already reached by the other side, the best meeting
+    cell of that level gives a shortest path, so the search stops; on long
+    corridors each side only has to cover about half the distance.
+    """
+    supports_fire_time = False
+    weighted = False
+
+    def __init__(self, passable, start, exits):
+        self.grid = FlatGrid(passable)
+        self.start = start
+        self.result = None
+        size = self.grid.size
+        # Index 0 grows from the start, index 1 from the exits
+        self.distance = (array('i', [UNREACHED]) * size, array('i', [UNREACHED]) * size)
+        self.parent = (array('i', [-1]) * size, array('i', [-1]) * size)
+        self.expanded = [0, 0]
+        self.opened = 0
+        self.best = (UNREACHED, -1) # (path length, meeting cell)
+
+        exit_indices = sorted({self.grid.index(pos) for pos in exits if self.grid.is_passable(pos)})
+        if not (self.grid.is_passable(start) and exit_indices):
+            self.frontiers = ([], [])
+            return
+        start_index = self.grid.index(start)
+        self.frontiers = ([start_index], exit_indices)
+        self.distance[0][start_index] = 0
+        for index in exit_indices:
+            self.distance[1][index] = 0
+        self.opened = 1 + len(exit_indices)
+        if start_index in exit_indices:
+            self.best = (0, start_index)
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def step(self):
+        """Expands one level of the smaller frontier and returns the positions it reached."""
+        if self.done:
+            return []
+        if self.best[1] != -1 or not (self.frontiers[0] and self.frontiers[1]):
+            self.finish()
+            return []
+
+        # Smaller frontier first; on a tie, the side that has done less work
+        sizes = [(len(frontier), expanded) for frontier, expanded in zip(self.frontiers, self.expanded)]
+        side = 0 if sizes[0] <= sizes[1] else 1
+        distance, parent = self.distance[side], self.parent[side]
+        other_distance = self.distance[1 - side]
+        passable, offsets = self.grid.passable, self.grid.offsets
+        best_length, meeting = self.best
+        next_frontier = []
+        for node in self.frontiers[side]:
+            next_distance = distance[node] + 1
+            for offset in offsets:
+                neighbor = node + offset
+                if not passable[neighbor] or distance[neighbor] != UNREACHED:
+                    continue
+                distance[neighbor] = next_distance
+                parent[neighbor] = node
+                next_frontier.append(neighbor)
+                if other_distance[neighbor] != UNREACHED and next_distance + other_distance[neighbor] < best_length:
+                    best_length, meeting = next_distance + other_distance[neighbor], neighbor
+
+        self.expanded[side] += len(self.frontiers[side])
+        self.opened += len(next_frontier)
+        self.frontiers[side][:] = next_frontier
+        self.best = (best_length, meeting)
+        if meeting != -1 or not next_frontier:
+            self.finish()
+        return [self.grid.pos(index) for index in next_frontier]
+
+    def finish(self):
+        meeting = self.best[1]
+        path = []
+        if meeting != -1:
+            curr = meeting
+            while curr != -1:
+                path.append(self.grid.pos(curr))
+                curr = self.parent[0][curr]
+            path.reverse()
+            curr = self.parent[1][meeting]
+            while curr != -1:
+                path.append(self.grid.pos(curr))
+                curr = self.parent[1][curr]
+        self.result = BidirectionalResult(path, self.expanded[0], self.expanded[1], self.opened)
+
+    def run(self):
+        while not self.done:
+            self.step()
+        return self.result
+
+    def __iter__(self):
+        while not self.done:
+            yield self.step()
+
+
+class BucketQueue:
+    """Priority queue for integer priorities that never drop below the last one popped.
+
+    Dial's algorithm: a ring of ``span`` buckets, one per priority value,
+    where every queued priority lies within ``span`` of the current one.
+    Push and pop are O(1) apart from skipping empty buckets; items with
+    equal priority come out last in, first out.
+    """
+
+    def __init__(self, span):
+        self.span = span
+        self.buckets = [[] for _ in range(span)]
+        self.current = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        self.buckets[priority % self.span].append(item)
+        self.size += 1
+
+    def pop(self):
+        """Returns (priority, item) with the smallest priority."""
+        buckets, span = self.buckets, self.span
+        while not buckets[self.current % span]:
+            self.current += 1
+        self.size -= 1
+        return self.current, buckets[self.current % span].pop()
+
+
+class TerrainSearch:
+    """A* (or Dijkstra) over per-cell movement costs, with optional diagonal moves.
+
+    ``costs`` is a (rows, cols) integer array of the cost of entering each
+    cell, 0 where it cannot be entered (see escape_terrain.cost_map()). A
+    diagonal move costs 1.4 times the cell's cost and is only allowed when
+    both cells beside it are passable, so paths never cut a wall's corner.
+    The heuristic is octile distance (Manhattan without diagonals) times the
+    cheapest cell cost, which never overestimates; with heuristic=False the
+    search is Dijkstra's algorithm. Costs are integers, so the open set is
+    a BucketQueue instead of a heap.
+    """
+    supports_fire_time = False
+    weighted = True
+
+    def __init__(self, costs, start, exits, diagonal=False, heuristic=True):
+        costs = np.asarray(costs)
+        self.grid = FlatGrid(costs > 0)
+        self.start = start
+        self.diagonal = diagonal
+        self.use_heuristic = heuristic
+        self.expanded = 0
+        self.opened = 1
+        self.result = None
+
+        size, width = self.grid.size, self.grid.width
+        self.cost = array('i', self.grid.pad(costs.astype(np.int32)).tobytes())
+        self.g_cost = array('i', [UNREACHED]) * size
+        self.parent = array('i', [-1]) * size
+        self.closed = bytearray(size)
+
+        # Moves as (offset, side_a, side_b): diagonals need both side cells open
+        self.moves = [(offset, 0, 0) for offset in self.grid.offsets]
+        if diagonal:
+            for vertical in (-width, width):
+                for horizontal in (-1, 1):
+                    self.moves.append((vertical + horizontal, vertical, horizontal))
+
+        passable_costs = costs[costs > 0]
+        min_cost = int(passable_costs.min()) if passable_costs.size else 1
+        max_cost = int(passable_costs.max()) if passable_costs.size else 1
+        self.straight_unit = min_cost if heuristic else 0
+        self.diagonal_unit = self.diagonal_cost(min_cost) if heuristic else 0
+
+        exit_indices = [self.grid.index(pos) for pos in exits if self.grid.is_passable(pos)]
+        self.exit_set = set(exit_indices)
+        self.exit_coords = [divmod(i, width) for i in exit_indices]
+
+        # f grows by at most a move's cost plus one heuristic step per expansion
+        self.open_set = BucketQueue(self.diagonal_cost(max_cost) + max(self.diagonal_unit, self.straight_unit) + 1)
+        if not (self.grid.is_passable(start) and self.exit_set):
+            return # Empty open set: the first step reports no path
+        start_index = self.grid.index(start)
+        self.g_cost[start_index] = 0
+        self.open_set.current = self.heuristic(start_index)
+        self.open_set.push(self.open_set.current, start_index)
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    @staticmethod
+    def diagonal_cost(cost):
+        return (cost * 14 + 5) // 10
+
+    def heuristic(self, index):
+        """Octile distance to the closest exit, in units of the cheapest cell."""
+        if not self.straight_unit:
+            return 0
+        r, c = divmod(index, self.grid.width)
+        best = UNREACHED
+        for end_r, end_c in self.exit_coords:
+            dr, dc = abs(r - end_r), abs(c - end_c)
+            if self.diagonal:
+                h = self.straight_unit * abs(dr - dc) + self.diagonal_unit * min(dr, dc)
+            else:
+                h = self.straight_unit * (dr + dc)
+            best = min(best, h)
+        return best
+
+    def step(self):
+        """Expands the cheapest node and returns the positions it added to the open set."""
+        if self.done:
+            return []
+        open_set, closed = self.open_set, self.closed
+        current = -1
+        while open_set:
+            current = open_set.pop()[1]
+            if not closed[current]:
+                break
+            current = -1 # Stale entry
+        if current == -1:
+            self.finish([])
+            return []
+        closed[current] = 1
+        self.expanded += 1
+        if current in self.exit_set:
+            self.finish(self.reconstruct_path(current))
+            return []
+
+        opened = []
+        for neighbor in self.relax(current):
+            opened.append(self.grid.pos(neighbor))
+        self.opened += len(opened)
+        return opened
+
+    def relax(self, current):
+        """Updates the neighbours of current; yields those (re)added to the open set."""
+        cost, g_cost, parent, closed = self.cost, self.g_cost, self.parent, self.closed
+        current_g = g_cost[current]
+        for offset, side_a, side_b in self.moves:
+            neighbor = current + offset
+            step_cost = cost[neighbor]
+            if not step_cost or closed[neighbor]:
+                continue
+            if side_a:
+                if not (cost[current + side_a] and cost[current + side_b]):
+                    continue # Would cut a corner
+                step_cost = self.diagonal_cost(step_cost)
+            temp_g_cost = current_g + step_cost
+            if temp_g_cost >= g_cost[neighbor]:
+                continue
+            g_cost[neighbor] = temp_g_cost
+            parent[neighbor] = current
+            self.open_set.push(temp_g_cost + self.heuristic(neighbor), neighbor)
+            yield neighbor
+
+    def run(self):
+        """Searches to the end in a tight loop; returns the SearchResult."""
+        if self.done:
+            return self.result
+        open_set, closed, cost, g_cost, parent = self.open_set, self.closed, self.cost, self.g_cost, self.parent
+        buckets, span = open_set.buckets, open_set.span
+        exit_set, moves, heuristic = self.exit_set, self.moves, self.heuristic
+        single_exit = len(self.exit_coords) == 1 and self.straight_unit
+        if single_exit:
+            end_r, end_c = self.exit_coords[0]
+            straight_unit, diagonal_unit, width = self.straight_unit, self.diagonal_unit, self.grid.width
+            diagonal = self.diagonal
+        reached = -1
+        expanded = opened = 0
+        f_cost, queued = open_set.current, open_set.size
+
+        while queued:
+            bucket = buckets[f_cost % span]
+            if not bucket:
+                f_cost += 1
+                continue
+            current = bucket.pop()
+            queued -= 1
+            if closed[current]:
+                continue # Stale entry
+            closed[current] = 1
+            expanded += 1
+            if current in exit_set:
+                reached = current
+                break
+            current_g = g_cost[current]
+            for offset, side_a, side_b in moves:
+                neighbor = current + offset
+                step_cost = cost[neighbor]
+                if not step_cost or closed[neighbor]:
+                    continue
+                if side_a:
+                    if not (cost[current + side_a] and cost[current + side_b]):
+                        continue
+                    step_cost = (step_cost * 14 + 5) // 10 # diagonal_cost(), inlined
+                temp_g_cost = current_g + step_cost
+                if temp_g_cost >= g_cost[neighbor]:
+                    continue
+                g_cost[neighbor] = temp_g_cost
+                parent[neighbor] = current
+                if single_exit:
+                    r, c = divmod(neighbor, width)
+                    dr, dc = abs(r - end_r), abs(c - end_c)
+                    if diagonal:
+                        h_cost = straight_unit * abs(dr - dc) + diagonal_unit * min(dr, dc)
+                    else:
+                        h_cost = straight_unit * (dr + dc)
+                else:
+                    h_cost = heuristic(neighbor)
+                buckets[(temp_g_cost + h_cost) % span].append(neighbor)
+                queued += 1
+                opened += 1
+
+        open_set.current, open_set.size = f_cost, queued
+        self.expanded += expanded
+        self.opened += opened
+        self.finish(self.reconstruct_path(reached) if reached != -1 else [])
+        return self.result
+
+    def reconstruct_path(self, exit_index):
+        path = []
+        curr = exit_index
+        while curr != -1:
+            path.append(self.grid.pos(curr))
+            curr = self.parent[curr]
+        return path[::-1]
+
+    def finish(self, path):
+        path_cost = self.g_cost[self.grid.index(path[-1])] if path else None
+        self.result = SearchResult(path, self.expanded, self.opened, path_cost)
+
+    def __iter__(self):
+        while not self.done:
+            yield self.step()
+
+
+class DijkstraSearch(TerrainSearch):
+    """TerrainSearch without a heuristic: expands cells strictly in order of cost."""
+
+    def __init__(self, costs, start, exits, diagonal=False):
+        super().__init__(costs, start, exits, diagonal, heuristic=False)
+
+
+class FieldSearch:
+    """Breadth-first search from all exits at once, stopping when it reaches the start.
+
+    Each step grows the ExitField by one wave; the route is then read off its
+    next-hop map. Use escape_fields.exit_field() directly to get routes for
+    many occupants from a single sweep.
+    """
+    supports_fire_time = False
+    weighted = False
+
+    def __init__(self, passable, start, exits):
+        self.start = start
+        self.field = ExitField(passable, exits)
+        self.result = None
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def step(self):
+        """Expands one wave and returns the positions it labelled."""
+        if self.done:
+            return []
+        field = self.field
+        if field.distance_to_exit(self.start) is None and not field.complete:
+            wave = [field.grid.pos(int(i)) for i in field.expand_wave()]
+        else:
+            wave = []
+        if field.distance_to_exit(self.start) is not None or field.complete:
+            self.result = SearchResult(field.route(self.start), field.reached, field.reached)
+        return wave
+
+    def run(self):
+        while not self.done:
+            self.step()
+        return self.result
+
+    def __iter__(self):
+        while not self.done:
+            yield self.step()
+
+
+ALGORITHMS = {
+    "astar": AStarSearch,
+    "jps": JumpPointSearch,
+    "field": FieldSearch,
+    "bidir": BidirectionalSearch,
+    "weighted": TerrainSearch,
+    "dijkstra": DijkstraSearch,
+}
+
+
+def make_search(passable, start, exits, algorithm="astar", fire_time=None, costs=None, diagonal=False,
+                jump_table=None):
+    """Creates a search of the given algorithm (a key of ALGORITHMS) to the nearest of exits.
+
+    With fire_time the route must stay ahead of the fire (see AStarSearch).
+    The weighted algorithms ("weighted" and "dijkstra") read ``costs``
+    (default: STEP_COST for every passable cell) and can move diagonally.
+    "jps" reuses ``jump_table`` if given (see JumpTable).
+    """
+    try:
+        search_class = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Available: {', '.join(ALGORITHMS)}") from None
+    if search_class.weighted:
+        if fire_time is not None:
+            raise ValueError(f"Algorithm '{algorithm}' cannot plan around spreading fire")
+        if costs is None:
+            costs = np.where(passable, STEP_COST, 0)
+        return search_class(costs, start, exits, diagonal=diagonal)
+    if costs is not None or diagonal:
+        raise ValueError(f"Algorithm '{algorithm}' moves in 4 directions at uniform cost; "
+                         f"use 'weighted' or 'dijkstra' for terrain costs")
+    if jump_table is not None:
+        if search_class is not JumpPointSearch:
+            raise ValueError(f"Algorithm '{algorithm}' does not use a jump table")
+        if fire_time is None:
+            return search_class(passable, start, exits, jump_table)
+    if fire_time is None:
+        return search_class(passable, start, exits)
+    if not search_class.supports_fire_time:
+        raise ValueError(f"Algorithm '{algorithm}' cannot plan around spreading fire")
+    return search_class(passable, start, exits, fire_time=fire_time)
+
+
+def find_path(passable, start, exits, algorithm="astar", fire_time=None, costs=None, diagonal=False,
+              jump_table=None):
+    """Runs a complete search and returns its SearchResult."""
+    return make_search(passable, start, exits, algorithm, fire_time, costs, diagonal, jump_table).run()
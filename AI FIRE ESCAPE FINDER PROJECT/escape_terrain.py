@@ -0,0 +1,42 @@
+"""Movement costs of the floor's terrain, for the weighted solvers.
+
+Costs are small integers per cell: the cost of stepping into it, with 10 for
+an ordinary step (a diagonal step costs 1.4 times as much). Smoke, stairs
+and doors are passable but slower, and cells near fire carry an extra heat
+penalty. Walls and fire cost 0, meaning they cannot be entered.
+"""
+import numpy as np
+
+from escape_grid import CELL_DOOR, CELL_FIRE, CELL_SMOKE, CELL_STAIRS, OBSTACLES
+
+STEP_COST = 10 # Cost of one straight step across open floor
+TERRAIN_COSTS = {
+    CELL_SMOKE: 30,
+    CELL_STAIRS: 20,
+    CELL_DOOR: 15,
+}
+HEAT_PENALTY = 20 # Added to cells within HEAT_RADIUS steps (8-neighbourhood) of fire
+HEAT_RADIUS = 1
+
+
+def cost_map(cells, heat_penalty=HEAT_PENALTY, heat_radius=HEAT_RADIUS):
+    """(rows, cols) uint16 array of the cost of entering each cell, 0 where it cannot be entered."""
+    cells = np.asarray(cells)
+    lookup = np.full(256, STEP_COST, dtype=np.uint16)
+    for cell_type, cost in TERRAIN_COSTS.items():
+        lookup[cell_type] = cost
+    lookup[list(OBSTACLES)] = 0
+    costs = lookup[cells]
+
+    if heat_penalty and heat_radius > 0:
+        # Dilate the fire by heat_radius cells in every direction (including diagonals)
+        hot = cells == CELL_FIRE
+        for _ in range(heat_radius):
+            grown = hot.copy()
+            grown[1:] |= hot[:-1]
+            grown[:-1] |= hot[1:]
+            hot = grown.copy()
+            hot[:, 1:] |= grown[:, :-1]
+            hot[:, :-1] |= grown[:, 1:]
+        costs[hot & (costs > 0)] += heat_penalty
+    return costs
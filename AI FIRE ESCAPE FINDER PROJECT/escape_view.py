@@ -0,0 +1,232 @@
+"""Canvas rendering of a FloorGrid for the Fire Escape Finder GUI."""
+import math
+import tkinter as tk
+
+import numpy as np
+
+MIN_CELL_SIZE = 0.05  # Pixels per cell when fully zoomed out
+MAX_CELL_SIZE = 60
+MAX_CANVAS_ITEMS = 4000 # More visible cells than this are drawn as one bitmap
+
+
+def hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class GridRenderer:
+    """Draws the visible part of a FloorGrid on a Tk canvas, with pan and zoom.
+
+    The view shows the grid at ``cell_size`` pixels per cell, scrolled so
+    that grid pixel (x, y) is at the canvas origin. Only cells inside the
+    window are drawn:
+
+    - While at most MAX_CANVAS_ITEMS cells are visible, each gets a canvas
+      rectangle that is recolored in place with ``itemconfig``. The
+      rectangles are only created again when the zoom or the window size
+      changes; panning moves them all with one ``move`` and recolors those
+      that now show a different cell type.
+    - When zoomed out further, the visible cells are drawn as a single
+      PhotoImage the size of the window, built from the grid with NumPy
+      (one pixel per cell at cell_size 1).
+
+    ``drawn`` remembers the cell type shown for every cell, and refresh()
+    only redraws cells where it differs from the grid.
+    """
+
+    def __init__(self, canvas, grid, cell_size, colors, outline, default_color):
+        self.canvas = canvas
+        self.grid = grid
+        self.cell_size = float(cell_size)
+        self.colors = colors
+        self.outline = outline
+        self.default_color = default_color
+        self.x = self.y = 0.0 # Scroll position, in grid pixels
+        self.width = int(canvas.cget("width"))
+        self.height = int(canvas.cget("height"))
+
+        # Cell type -> RGB, for the bitmap
+        self.palette = np.tile(np.array(hex_to_rgb(default_color), dtype=np.uint8), (256, 1))
+        for cell_type, color in colors.items():
+            self.palette[cell_type] = hex_to_rgb(color)
+        self.background = np.array(hex_to_rgb(outline), dtype=np.uint8)
+
+        self.drawn = None  # (rows, cols) cell type shown for each cell
+        self.items = None  # Canvas item ids of the visible cells, or None in bitmap mode
+        self.origin = (0, 0) # Grid (row, col) of items[0, 0]
+        self.item_offset = (0.0, 0.0) # Canvas (x, y) of items[0, 0]
+        self.item_size = None # cell_size the items were created at
+        self.image = None  # PhotoImage in bitmap mode (kept referenced so Tk does not drop it)
+        self._bitmap_pending = False
+
+    def color(self, cell_type):
+        return self.colors.get(cell_type, self.default_color)
+
+    # --- View ---
+    def visible_range(self):
+        """(row0, row1, col0, col1): the cells at least partly inside the window."""
+        size = self.cell_size
+        rows, cols = self.grid.shape
+        row0 = min(rows, max(0, int(self.y // size)))
+        col0 = min(cols, max(0, int(self.x // size)))
+        row1 = min(rows, max(row0, math.ceil((self.y + self.height) / size)))
+        col1 = min(cols, max(col0, math.ceil((self.x + self.width) / size)))
+        return row0, row1, col0, col1
+
+    def window_shape(self):
+        """(rows, cols) of cell items needed to cover the window at any scroll position."""
+        rows, cols = self.grid.shape
+        return (min(rows, int(self.height // self.cell_size) + 2),
+                min(cols, int(self.width // self.cell_size) + 2))
+
+    def window_origin(self, shape):
+        """Grid (row, col) of the top-left cell item for the current scroll position."""
+        rows, cols = self.grid.shape
+        return (max(0, min(int(self.y // self.cell_size), rows - shape[0])),
+                max(0, min(int(self.x // self.cell_size), cols - shape[1])))
+
+    def cell_at(self, x, y):
+        """(row, col) under canvas position (x, y); may be outside the grid."""
+        return int((self.y + y) // self.cell_size), int((self.x + x) // self.cell_size)
+
+    def resize(self, width, height):
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = max(1, width), max(1, height)
+            self.scroll_to(self.x, self.y)
+
+    def pan(self, dx, dy):
+        """Scrolls the view by (dx, dy) screen pixels."""
+        self.scroll_to(self.x + dx, self.y + dy)
+
+    def zoom(self, factor, x=None, y=None):
+        """Zooms by factor, keeping canvas position (x, y) (default: the window centre) in place."""
+        x = self.width / 2 if x is None else x
+        y = self.height / 2 if y is None else y
+        old_size = self.cell_size
+        self.cell_size = min(MAX_CELL_SIZE, max(self.fit_cell_size(), old_size * factor))
+        scale = self.cell_size / old_size
+        self.scroll_to((self.x + x) * scale - x, (self.y + y) * scale - y)
+
+    def fit_cell_size(self):
+        """Cell size at which the whole grid fits in the window."""
+        rows, cols = self.grid.shape
+        return max(MIN_CELL_SIZE, min(self.width / cols, self.height / rows, MAX_CELL_SIZE))
+
+    def scroll_to(self, x, y):
+        rows, cols = self.grid.shape
+        self.x = min(max(0.0, x), max(0.0, cols * self.cell_size - self.width))
+        self.y = min(max(0.0, y), max(0.0, rows * self.cell_size - self.height))
+        if self.items is None or self.items.shape != self.window_shape() or self.item_size != self.cell_size:
+            self.build()
+        else:
+            self.shift()
+
+    # --- Drawing ---
+    def build(self):
+        """Redraws the visible cells from scratch for the current view."""
+        self.canvas.delete("all")
+        self.items = None
+        self.image = None
+        if self.drawn is None or self.drawn.shape != self.grid.shape:
+            self.drawn = self.grid.cells.copy()
+
+        shape = self.window_shape()
+        if shape[0] * shape[1] > MAX_CANVAS_ITEMS:
+            self.draw_bitmap()
+            return
+
+        size = self.cell_size
+        row0, col0 = self.origin = self.window_origin(shape)
+        self.item_offset = (col0 * size - self.x, row0 * size - self.y)
+        self.item_size = size
+        self.items = np.zeros(shape, dtype=np.int64)
+        create_rectangle = self.canvas.create_rectangle
+        for i, cell_row in enumerate(self.drawn[row0:row0 + shape[0], col0:col0 + shape[1]].tolist()):
+            y1 = (row0 + i) * size - self.y
+            for j, cell_type in enumerate(cell_row):
+                x1 = (col0 + j) * size - self.x
+                self.items[i, j] = create_rectangle(x1, y1, x1 + size, y1 + size, fill=self.color(cell_type),
+                                                    outline=self.outline, width=1)
+
+    def shift(self):
+        """Follows a scroll with the existing items: moves them all and recolors the ones showing new cells."""
+        (height, width), size = self.items.shape, self.cell_size
+        row0, col0 = self.window_origin(self.items.shape)
+        x, y = col0 * size - self.x, row0 * size - self.y
+        self.canvas.move("all", x - self.item_offset[0], y - self.item_offset[1])
+        self.item_offset = (x, y)
+        if (row0, col0) == self.origin:
+            return
+
+        # Each item keeps its place in the window and takes the color of its new cell
+        old_row0, old_col0 = self.origin
+        old = self.drawn[old_row0:old_row0 + height, old_col0:old_col0 + width]
+        new = self.drawn[row0:row0 + height, col0:col0 + width]
+        self.origin = (row0, col0)
+        itemconfig, color = self.canvas.itemconfig, self.color
+        for i, j in zip(*np.nonzero(old != new)):
+            itemconfig(int(self.items[i, j]), fill=color(int(new[i, j])))
+
+    def draw_bitmap(self):
+        """Draws the window as one image: each pixel takes the color of the cell under it."""
+        rows, cols = self.grid.shape
+        row_index = ((np.arange(self.height) + self.y) / self.cell_size).astype(np.int64)
+        col_index = ((np.arange(self.width) + self.x) / self.cell_size).astype(np.int64)
+        rgb = self.palette[self.drawn[np.minimum(row_index, rows - 1)[:, None], np.minimum(col_index, cols - 1)]]
+        rgb[row_index >= rows] = self.background
+        rgb[:, col_index >= cols] = self.background
+
+        header = f"P6 {self.width} {self.height} 255 ".encode()
+        self.image = tk.PhotoImage(data=header + rgb.tobytes(), format="PPM")
+        self.canvas.delete("all")
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+
+    def schedule_bitmap(self):
+        """Redraws the bitmap once the current burst of cell updates is over."""
+        if not self._bitmap_pending:
+            self._bitmap_pending = True
+            self.canvas.after_idle(self._flush_bitmap)
+
+    def _flush_bitmap(self):
+        self._bitmap_pending = False
+        if self.items is None: # Still zoomed out
+            self.draw_bitmap()
+
+    def draw_cell(self, row, col, cell_type):
+        """Shows cell_type at (row, col), if it is not shown already."""
+        if self.drawn is None:
+            self.build()
+        if self.drawn[row, col] == cell_type:
+            return
+        self.drawn[row, col] = cell_type
+        if self.items is None:
+            row0, row1, col0, col1 = self.visible_range()
+            if row0 <= row < row1 and col0 <= col < col1:
+                self.schedule_bitmap()
+            return
+        i, j = row - self.origin[0], col - self.origin[1]
+        if 0 <= i < self.items.shape[0] and 0 <= j < self.items.shape[1]:
+            self.canvas.itemconfig(int(self.items[i, j]), fill=self.color(cell_type))
+
+    def refresh(self):
+        """Brings the canvas up to date with the grid; returns how many cells changed."""
+        if self.drawn is None or self.drawn.shape != self.grid.shape:
+            self.drawn = None
+            self.build()
+            return self.grid.cells.size
+        rows, cols = np.nonzero(self.drawn != self.grid.cells)
+        changed = len(rows)
+        if not changed:
+            return 0
+        self.drawn[rows, cols] = self.grid.cells[rows, cols]
+        if self.items is None:
+            self.schedule_bitmap()
+            return changed
+
+        # Recolor the dirty cells that are on screen
+        rows, cols = rows - self.origin[0], cols - self.origin[1]
+        on_screen = (rows >= 0) & (rows < self.items.shape[0]) & (cols >= 0) & (cols < self.items.shape[1])
+        itemconfig, color = self.canvas.itemconfig, self.color
+        for i, j in zip(rows[on_screen].tolist(), cols[on_screen].tolist()):
+            itemconfig(int(self.items[i, j]), fill=color(int(self.drawn[self.origin[0] + i, self.origin[1] + j])))
+        return changed
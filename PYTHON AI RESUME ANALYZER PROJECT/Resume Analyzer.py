@@ -4,12 +4,18 @@ from ttkbootstrap.scrolled import ScrolledText
 from tkinter import filedialog, messagebox
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import re
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 import os  # Added for file name handling
+import io
 import json # Added for custom job roles
+import hashlib
+from collections import OrderedDict
+from resume_cache import ExtractionCache
+from resume_extract import is_supported
+from resume_jobs import JobScheduler
+from resume_matcher import IncrementalScorer
 
 # --- NEW: Import for PDF Preview and Treemap ---
 try:
@@ -45,6 +51,10 @@ except ImportError:
     Document = None
 # ---------------------------------------------------------------------
 
+# Only the first pages of very long PDFs are loaded into the text area
+MAX_UPLOAD_PAGES = 50
+MAX_CACHED_CHARTS = 32 # Rendered chart PNGs kept in memory
+
 
 class ResumeAnalyzer:
     def __init__(self):
@@ -101,7 +111,9 @@ class ResumeAnalyzer:
         
         # --- NEW: Load roles from JSON ---
         self.roles_file = 'job_roles.json'
+        self.roles_file_state = None # (mtime, size, sha256) of the roles file last loaded/saved
         self.job_roles = self.load_roles()
+        self.scorer = IncrementalScorer(self.job_roles) # Keeps keyword counts of analyzed resumes
         # ---------------------------------
 
         # Initialize main window using ttkbootstrap
@@ -117,6 +129,21 @@ class ResumeAnalyzer:
         self.resume_text = ""
         self.analysis_results = {}
         self.preview_photo = None # For PDF preview
+        self.extraction_cache = ExtractionCache() # Extracted text + previews, keyed by file content
+
+        # --- NEW: Worker threads for file reading and analysis ---
+        self.analysis_jobs = JobScheduler(self.root)
+        self.upload_jobs = JobScheduler(self.root)
+
+        # --- NEW: Lazily rendered charts ---
+        self.viz_dirty = False # Charts are out of date with analysis_results
+        self.viz_results_key = None # Hash of the results the charts show
+        self.chart_figures = {} # Chart name -> reused matplotlib Figure
+        self.chart_artists = {} # Figure -> (state, artists) for in-place updates
+        self.chart_png_cache = OrderedDict() # (chart, results hash, theme) -> PNG bytes
+        self.chart_slots = {} # Chart name -> placeholder not rendered yet
+        self.chart_photos = [] # Keeps the shown PhotoImages alive
+        self.viz_check_pending = False
 
         self.setup_gui()
 
@@ -129,6 +156,7 @@ class ResumeAnalyzer:
                 # File is empty, use default and save
                 self.save_roles(self.default_job_roles)
                 return self.default_job_roles
+            self.roles_file_state = self.read_roles_file_state()
             return roles
         except (FileNotFoundError, json.JSONDecodeError):
             # File doesn't exist or is invalid, create it with defaults
@@ -143,8 +171,39 @@ class ResumeAnalyzer:
         try:
             with open(self.roles_file, 'w') as f:
                 json.dump(roles_data, f, indent=4)
+            self.roles_file_state = self.read_roles_file_state()
         except Exception as e:
             messagebox.showerror("Save Error", f"Failed to save roles to {self.roles_file}: {e}")
+
+    # --- NEW: Change detection for the roles file ---
+    def read_roles_file_state(self):
+        """Returns (mtime, size, sha256) of the roles file, or None if it is missing."""
+        try:
+            stat = os.stat(self.roles_file)
+            with open(self.roles_file, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, digest)
+
+    def reload_roles_if_changed(self):
+        """Reloads the roles file only if it changed on disk since it was last loaded or saved."""
+        try:
+            stat = os.stat(self.roles_file)
+        except OSError:
+            stat = None
+        if stat is not None and self.roles_file_state is not None:
+            if (stat.st_mtime_ns, stat.st_size) == self.roles_file_state[:2]:
+                return False # Untouched, skip hashing
+            state = self.read_roles_file_state()
+            if state is not None and state[2] == self.roles_file_state[2]:
+                self.roles_file_state = state # Touched but same content
+                return False
+
+        self.job_roles = self.load_roles()
+        self.scorer.set_roles(self.job_roles) # Rescores only the roles that differ
+        self.update_role_combobox()
+        return True
     # ------------------------------------
 
     def setup_gui(self):
@@ -169,6 +228,7 @@ class ResumeAnalyzer:
         self.viz_frame = ttk.Frame(self.notebook, padding=10)
         self.notebook.add(self.viz_frame, text=" 📈 Visualizations ")
         self.setup_viz_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
         # --- NEW: Manage Roles Tab ---
         self.manage_roles_frame = ttk.Frame(self.notebook, padding=10)
@@ -289,6 +349,22 @@ class ResumeAnalyzer:
                                padding=(10, 8))
         clear_btn.pack(fill='x', pady=5)
 
+        # --- NEW: Progress of background jobs ---
+        self.job_status_var = tk.StringVar(value="Ready")
+        job_status_label = ttk.Label(analyze_controls_frame, textvariable=self.job_status_var,
+                                     font=("", 9), bootstyle="secondary")
+        job_status_label.pack(fill='x', pady=(10, 2))
+
+        self.job_progress = ttk.Progressbar(analyze_controls_frame, mode='determinate', maximum=100,
+                                            bootstyle="success-striped")
+        self.job_progress.pack(fill='x', pady=2)
+
+        self.cancel_btn = ttk.Button(analyze_controls_frame, text="Cancel",
+                                     command=self.cancel_jobs, bootstyle="secondary-outline",
+                                     state="disabled")
+        self.cancel_btn.pack(fill='x', pady=5)
+        # ----------------------------------------
+
         # --- Populate Right Column ---
 
         paste_text_frame = ttk.Labelframe(right_column, text="Resume Content", padding=15)
@@ -484,6 +560,10 @@ class ResumeAnalyzer:
             
             # Save to file
             self.save_roles(self.job_roles)
+
+            # Rescore just this role for every analyzed resume
+            self.scorer.update_role(role_name, new_role_data)
+            self.refresh_analysis()
             
             # Update UI
             self.update_role_combobox()
@@ -513,6 +593,8 @@ class ResumeAnalyzer:
             
             # Save changes to file
             self.save_roles(self.job_roles)
+            self.scorer.remove_role(role_name)
+            self.refresh_analysis()
             
             # Update UI
             self.clear_role_fields()
@@ -562,37 +644,49 @@ class ResumeAnalyzer:
     # ---------------------------------
 
     # --- NEW: Helper for PDF Preview ---
-    def show_pdf_preview(self, file_path):
+    def show_pdf_preview(self, file_path, cache_key=None):
         """Renders the first page of a PDF in the preview label."""
         if fitz is None or Image is None or ImageTk is None:
             self.clear_pdf_preview("PDF libraries not loaded.")
             return
 
         try:
+            self.show_preview_image(self.render_pdf_preview(file_path, cache_key))
+        except Exception as e:
+            self.clear_pdf_preview(f"Error: {e}")
+            print(f"Failed to preview PDF: {e}")
+
+    def render_pdf_preview(self, file_path, cache_key=None):
+        """Returns the first page of a PDF as PNG bytes (no Tk calls, safe on a worker thread)."""
+        # --- NEW: Reuse the cached first-page render when the file is unchanged ---
+        cache_key = cache_key or self.extraction_cache.key_for(file_path)
+        png_bytes = self.extraction_cache.get_preview(cache_key)
+        if png_bytes is None:
             doc = fitz.open(file_path)
             page = doc.load_page(0) # Get first page
 
             # Render page to pixels
             pix = page.get_pixmap()
-            
-            # Convert to PIL Image
-            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-            
-            # Resize image to fit label (max width of the left column)
-            max_w = 250 # Should match the canvas width minus padding
-            if img.width > max_w:
-                w_percent = (max_w / float(img.width))
-                h_size = int((float(img.height) * float(w_percent)))
-                img = img.resize((max_w, h_size), Image.LANCZOS)
-
-            # Convert to PhotoImage and display
-            self.preview_photo = ImageTk.PhotoImage(img)
-            self.preview_image_label.configure(image=self.preview_photo, text="")
+            png_bytes = pix.tobytes("png")
             doc.close()
+            self.extraction_cache.put_preview(cache_key, png_bytes)
+        return png_bytes
 
-        except Exception as e:
-            self.clear_pdf_preview(f"Error: {e}")
-            print(f"Failed to preview PDF: {e}")
+    def show_preview_image(self, png_bytes):
+        """Displays a rendered preview in the preview label."""
+        # Convert to PIL Image
+        img = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+        
+        # Resize image to fit label (max width of the left column)
+        max_w = 250 # Should match the canvas width minus padding
+        if img.width > max_w:
+            w_percent = (max_w / float(img.width))
+            h_size = int((float(img.height) * float(w_percent)))
+            img = img.resize((max_w, h_size), Image.LANCZOS)
+
+        # Convert to PhotoImage and display
+        self.preview_photo = ImageTk.PhotoImage(img)
+        self.preview_image_label.configure(image=self.preview_photo, text="")
 
     # --- NEW: Helper for PDF Preview ---
     def clear_pdf_preview(self, text="Upload a PDF to see a preview"):
@@ -619,55 +713,81 @@ class ResumeAnalyzer:
             ]
         )
 
-        if file_path:
+        if not file_path:
+            return
+
+        if not is_supported(file_path):
+            self.clear_pdf_preview("Preview only for PDF files.")
+            messagebox.showwarning("Unsupported Format", "Please upload a .txt, .pdf, or .docx file.")
+            return
+
+        # --- NEW: Read the file on a worker thread so the window stays responsive ---
+        self.upload_jobs.submit(self.run_upload_job, file_path,
+                                on_done=self.on_upload_done,
+                                on_error=self.on_upload_error,
+                                on_progress=self.on_job_progress)
+        self.set_job_status("Reading file...", 0)
+
+    def run_upload_job(self, job, file_path):
+        """Worker thread: extracts the text (and PDF preview) of an uploaded file."""
+        # Content hash: re-uploads of the same file skip extraction and rendering
+        cache_key = self.extraction_cache.key_for(file_path)
+
+        preview_png = None
+        if file_path.endswith('.pdf') and Image is not None and ImageTk is not None:
+            job.report(0.2, "Rendering preview...")
             try:
-                content = ""
-                
-                # --- NEW: Handle PDF Preview ---
-                if file_path.endswith('.pdf'):
-                    self.show_pdf_preview(file_path)
-                else:
-                    self.clear_pdf_preview("Preview only for PDF files.")
-                # -------------------------------
-
-                # TXT file
-                if file_path.endswith('.txt'):
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        content = file.read()
-
-                # PDF file
-                elif file_path.endswith('.pdf'):
-                    pdf_doc = fitz.open(file_path)
-                    for page in pdf_doc:
-                        content += page.get_text()
-                    pdf_doc.close()
-
-                # Word file (.docx)
-                elif file_path.endswith('.docx'):
-                    doc = Document(file_path)
-                    for para in doc.paragraphs:
-                        content += para.text + "\n"
+                preview_png = self.render_pdf_preview(file_path, cache_key)
+            except Exception as e:
+                print(f"Failed to preview PDF: {e}")
+
+        job.report(0.4, "Extracting text...")
+        # Long PDFs (e.g. portfolios) are cut off instead of stalling the app
+        content, pages_read = self.extraction_cache.extract(file_path, cache_key, max_pages=MAX_UPLOAD_PAGES)
+        truncated = False
+        if pages_read >= MAX_UPLOAD_PAGES and file_path.endswith('.pdf'):
+            # Hitting the limit exactly is not a cut-off; check the real page count
+            doc = fitz.open(file_path)
+            truncated = doc.page_count > MAX_UPLOAD_PAGES
+            doc.close()
+        return file_path, content, truncated, preview_png
 
-                else:
-                    messagebox.showwarning("Unsupported Format", "Please upload a .txt, .pdf, or .docx file.")
-                    return
+    def on_upload_done(self, payload):
+        file_path, content, truncated, preview_png = payload
+        self.set_job_status("Ready")
 
-                if not content.strip():
-                    messagebox.showwarning("Empty File", "The file seems to be empty.")
-                    return
+        # --- NEW: Handle PDF Preview ---
+        if preview_png is not None:
+            try:
+                self.show_preview_image(preview_png)
+            except Exception as e:
+                self.clear_pdf_preview(f"Error: {e}")
+        elif file_path.endswith('.pdf'):
+            self.clear_pdf_preview("Preview could not be rendered.")
+        else:
+            self.clear_pdf_preview("Preview only for PDF files.")
+        # -------------------------------
 
-                # Paste content into text area
-                self.resume_text_area.delete(1.0, tk.END)
-                self.resume_text_area.insert(1.0, content)
+        if not content.strip():
+            messagebox.showwarning("Empty File", "The file seems to be empty.")
+            return
 
-                # Update the status label with the file name
-                file_name = os.path.basename(file_path)
-                self.file_status_var.set(f"Successfully loaded: {file_name}")
+        # Paste content into text area
+        self.resume_text_area.delete(1.0, tk.END)
+        self.resume_text_area.insert(1.0, content)
 
-                messagebox.showinfo("Success", "Resume uploaded successfully!")
+        # Update the status label with the file name
+        file_name = os.path.basename(file_path)
+        if truncated:
+            self.file_status_var.set(f"Successfully loaded: {file_name} (first {MAX_UPLOAD_PAGES} pages)")
+        else:
+            self.file_status_var.set(f"Successfully loaded: {file_name}")
 
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to read file: {str(e)}")
+        messagebox.showinfo("Success", "Resume uploaded successfully!")
+
+    def on_upload_error(self, error):
+        self.set_job_status("Ready")
+        messagebox.showerror("Error", f"Failed to read file: {str(error)}")
 
     def clear_text(self):
         self.resume_text_area.delete(1.0, tk.END)
@@ -713,104 +833,87 @@ class ResumeAnalyzer:
         self.clear_pdf_preview("Preview only for PDF files.")
 
     def analyze_resume(self):
-        self.resume_text = self.resume_text_area.get(1.0, tk.END).strip()
+        resume_text = self.resume_text_area.get(1.0, tk.END).strip()
 
-        if not self.resume_text:
+        if not resume_text:
             messagebox.showwarning("Input Error", "Please enter or upload resume text.")
             return
 
-        # Perform analysis
-        try:
-            # --- RELOAD ROLES IN CASE THEY WERE EDITED ---
-            self.job_roles = self.load_roles()
-            # -------------------------------------------
+        # --- RELOAD ROLES IF THE FILE WAS EDITED ---
+        self.reload_roles_if_changed()
+        # -------------------------------------------
 
-            self.analysis_results = self.analyze_resume_text(self.resume_text)
-            
+        if not self.job_roles:
+            messagebox.showwarning("No Roles", "No job roles are defined. Please add one in the 'Manage Roles' tab.")
+            return
+
+        # --- NEW: Score on a worker thread; a newer analysis supersedes this one ---
+        self.analysis_jobs.submit(self.run_analysis_job, resume_text,
+                                  on_done=self.on_analysis_done,
+                                  on_error=self.on_analysis_error,
+                                  on_progress=self.on_job_progress)
+        self.set_job_status("Analyzing resume...", 0)
+
+    def run_analysis_job(self, job, resume_text):
+        """Worker thread: scores the resume against every role (no Tk calls here)."""
+        job.report(0.1, "Matching keywords...")
+        results = self.scorer.score(resume_text)
+        job.report(0.9, "Preparing results...")
+        return resume_text, results
+
+    def on_analysis_done(self, payload):
+        self.resume_text, self.analysis_results = payload
+        try:
             # Switch to analysis tab and display results
             self.notebook.select(1)  # Switch to Analysis Results tab
             self.display_analysis_results()
 
             # Generate visualizations
             self.generate_visualizations()
-
-            messagebox.showinfo("Analysis Complete", "Resume analysis completed successfully!")
-        
+            self.set_job_status("Analysis complete", 1.0)
         except Exception as e:
-            messagebox.showerror("Analysis Error", f"An unexpected error occurred during analysis: {e}")
-
+            self.on_analysis_error(e)
+
+    def on_analysis_error(self, error):
+        self.set_job_status("Ready")
+        messagebox.showerror("Analysis Error", f"An unexpected error occurred during analysis: {error}")
+
+    # --- NEW: Background job helpers ---
+    def set_job_status(self, message, fraction=None):
+        """Updates the progress label/bar (Tk thread only)."""
+        self.job_status_var.set(message)
+        if fraction is not None:
+            self.job_progress.configure(value=fraction * 100)
+        busy = self.analysis_jobs.busy or self.upload_jobs.busy
+        self.cancel_btn.configure(state="normal" if busy else "disabled")
+
+    def on_job_progress(self, fraction, message):
+        """Progress callback for jobs; Job.report passes (fraction, message)."""
+        self.set_job_status(message, fraction)
+
+    def cancel_jobs(self):
+        self.analysis_jobs.cancel()
+        self.upload_jobs.cancel()
+        self.set_job_status("Cancelled", 0)
+    # -----------------------------------
 
     def analyze_resume_text(self, text):
-        results = {}
-        text_lower = text.lower()
-        
         if not self.job_roles:
             messagebox.showwarning("No Roles", "No job roles are defined. Please add one in the 'Manage Roles' tab.")
             return {}
 
-        for role, role_data in self.job_roles.items():
-            # Calculate skill match
-            skill_score = 0
-            # Use sum of weights as max score
-            max_skill_score = sum(role_data.get("keywords", {}).values())
-            
-            found_skills = {}
-            for skill, weight in role_data.get("keywords", {}).items():
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    # Score based on weight * occurrences
-                    skill_score += weight * len(matches) 
-                    found_skills[skill] = len(matches)
-            
-            # Normalize the score against the max possible score (if all skills found once)
-            skill_match_percentage = (skill_score / max_skill_score) * 100 if max_skill_score > 0 else 0
-            
-            # --- Better approach: Cap score at max_skill_score ---
-            skill_score_capped = 0
-            for skill, weight in role_data.get("keywords", {}).items():
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    skill_score_capped += weight # Add weight only once per skill
-                    
-            # Recalculate percentage based on finding the skill *at all*
-            skill_match_percentage = (skill_score_capped / max_skill_score) * 100 if max_skill_score > 0 else 0
-
-
-            # Calculate experience indicators
-            exp_score = 0
-            max_exp_score = sum(role_data.get("experience_keywords", {}).values())
-            
-            found_exp = {}
-            for exp_keyword, weight in role_data.get("experience_keywords", {}).items():
-                pattern = r'\b' + re.escape(exp_keyword) + r'\b'
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    exp_score += weight * len(matches)
-                    found_exp[exp_keyword] = len(matches)
-            
-            # Same cap logic for experience
-            exp_score_capped = 0
-            for exp_keyword, weight in role_data.get("experience_keywords", {}).items():
-                pattern = r'\b' + re.escape(exp_keyword) + r'\b'
-                if re.search(pattern, text_lower):
-                    exp_score_capped += weight
-            
-            exp_match_percentage = (exp_score_capped / max_exp_score) * 100 if max_exp_score > 0 else 0
-
-            # Calculate overall match (weighted average)
-            overall_match = (skill_match_percentage * 0.7) + (exp_match_percentage * 0.3)
-            
-            results[role] = {
-                "skill_match": skill_match_percentage,
-                "experience_match": exp_match_percentage,
-                "overall_match": overall_match,
-                "found_skills": found_skills, # Keep original count here for user info
-                "found_experience": found_exp,
-                "missing_skills": [skill for skill in role_data.get("keywords", {}) if skill not in found_skills]
-            }
+        # Keyword counts are cached per resume, so re-analyzing is a lookup
+        return self.scorer.score(text)
 
-        return results
+    # --- NEW: Refresh shown results after a role edit ---
+    def refresh_analysis(self):
+        """Re-displays the current analysis using the incrementally updated scores."""
+        if not self.analysis_results or not self.resume_text:
+            return
+        self.analysis_results = self.scorer.score(self.resume_text)
+        self.display_analysis_results()
+        self.generate_visualizations()
+    # ---------------------------------------------------
 
     def display_analysis_results(self):
         # Clear previous results
@@ -971,6 +1074,39 @@ class ResumeAnalyzer:
     # -----------------------------------
 
     def generate_visualizations(self):
+        """Marks the charts out of date; they are drawn when the Visualizations tab is shown."""
+        self.viz_dirty = True
+        if self.analysis_results:
+            self.viz_results_key = hashlib.sha1(
+                json.dumps(self.analysis_results, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        if self.notebook.select() == str(self.viz_frame):
+            self.render_visualizations()
+
+    # --- NEW: Lazy chart rendering ---
+    def on_tab_changed(self, event=None):
+        if self.viz_dirty and self.notebook.select() == str(self.viz_frame):
+            self.render_visualizations()
+
+    def chart_specs(self):
+        """Returns [(name, figsize, draw function)] for the charts the current results can show."""
+        specs = [("match", (10, 6), self.create_match_comparison_chart)]
+        has_skills = any(data.get('found_skills') for data in self.analysis_results.values())
+        # --- NEW: Add Treemap ---
+        if squarify and has_skills:
+            specs.append(("treemap", (10, 6), self.create_skill_treemap))
+        # ------------------------
+        if has_skills:
+            specs.append(("skills", (10, 8), self.create_skill_breakdown_chart))
+        if len(self.analysis_results) >= 3: # Radar charts need at least 3 points
+            specs.append(("radar", (8, 8), self.create_radar_chart))
+        return specs
+
+    def render_visualizations(self):
+        """Lays out the Visualizations tab with one placeholder per chart."""
+        self.viz_dirty = False
+        self.chart_slots = {}
+        self.chart_photos = []
+
         # Clear previous visualizations
         for widget in self.viz_container.winfo_children():
             widget.destroy()
@@ -1009,7 +1145,12 @@ class ResumeAnalyzer:
         self.viz_canvas.bind("<Configure>", on_canvas_configure)
         
         # 6. Configure the canvas to use the scrollbar
-        self.viz_canvas.configure(yscrollcommand=scrollbar.set)
+        # (every scroll or resize also checks which charts came into view)
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self.schedule_visible_check()
+
+        self.viz_canvas.configure(yscrollcommand=on_scroll)
 
         # 7. Pack the canvas and scrollbar into the main container
         self.viz_canvas.pack(side="left", fill="both", expand=True)
@@ -1024,16 +1165,72 @@ class ResumeAnalyzer:
                           font=("", 18, "bold"), bootstyle=title_bootstyle)
         title.pack(pady=10, fill='x', padx=10)
 
-        # Create visualizations (pack into the scrollable_frame)
-        self.create_match_comparison_chart(self.viz_scrollable_frame)
-        # --- NEW: Add Treemap ---
-        if squarify:
-            self.create_skill_treemap(self.viz_scrollable_frame)
-        # ------------------------
-        self.create_skill_breakdown_chart(self.viz_scrollable_frame)
-        self.create_radar_chart(self.viz_scrollable_frame)
+        # Placeholders sized like the finished charts, so the scroll region is right from the start
+        for name, figsize, draw in self.chart_specs():
+            slot = ttk.Frame(self.viz_scrollable_frame, width=int(figsize[0] * 100), height=int(figsize[1] * 100))
+            slot.pack_propagate(False)
+            slot.pack(fill='x', padx=10, pady=10)
+            label = ttk.Label(slot, text="Rendering chart...", bootstyle="secondary", anchor="center")
+            label.pack(fill='both', expand=True)
+            self.chart_slots[name] = (slot, label, figsize, draw)
+
+        self.schedule_visible_check()
+
+    def schedule_visible_check(self):
+        if not self.viz_check_pending:
+            self.viz_check_pending = True
+            self.root.after_idle(self.render_visible_charts)
+
+    def render_visible_charts(self):
+        """Renders the placeholders that overlap the visible part of the canvas."""
+        self.viz_check_pending = False
+        if not self.chart_slots or not self.viz_canvas.winfo_exists():
+            return
+        top = self.viz_canvas.canvasy(0)
+        bottom = top + self.viz_canvas.winfo_height()
+        for name, (slot, label, figsize, draw) in list(self.chart_slots.items()):
+            y = slot.winfo_y()
+            if y < bottom and y + slot.winfo_height() > top:
+                del self.chart_slots[name]
+                png_bytes = self.render_chart_png(name, figsize, draw)
+                photo = ImageTk.PhotoImage(Image.open(io.BytesIO(png_bytes)))
+                self.chart_photos.append(photo)
+                label.configure(image=photo, text="")
+
+    def render_chart_png(self, name, figsize, draw):
+        """Returns the chart as PNG bytes, drawing it only if these results/theme were not rendered before."""
+        key = (name, self.viz_results_key, self.style.theme.name)
+        png_bytes = self.chart_png_cache.get(key)
+        if png_bytes is not None:
+            self.chart_png_cache.move_to_end(key)
+            return png_bytes
+
+        fig = self.chart_figures.get(name)
+        if fig is None:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            self.chart_figures[name] = fig
+        draw(fig)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', facecolor=fig.get_facecolor())
+        png_bytes = buf.getvalue()
+        self.chart_png_cache[key] = png_bytes
+        while len(self.chart_png_cache) > MAX_CACHED_CHARTS:
+            self.chart_png_cache.popitem(last=False)
+        return png_bytes
+    # ---------------------------------
 
-    def create_match_comparison_chart(self, parent):
+    def style_chart_figure(self, fig, **subplot_kw):
+        """Clears a reused figure and returns a fresh axes in the current theme's colors."""
+        self.chart_artists.pop(fig, None)
+        fig.clear()
+        ax = fig.add_subplot(111, **subplot_kw)
+        fig.patch.set_facecolor(self.root.style.colors.bg) # Match fig background to app
+        ax.set_facecolor(self.root.style.colors.bg) # Match plot background to app
+        return ax
+
+    def create_match_comparison_chart(self, fig):
         # Prepare data for bar chart
         roles = list(self.analysis_results.keys())
         if not roles: return # Nothing to plot
@@ -1042,6 +1239,18 @@ class ResumeAnalyzer:
         skill_matches = [self.analysis_results[role]['skill_match'] for role in roles]
         exp_matches = [self.analysis_results[role]['experience_match'] for role in roles]
 
+        # Same roles and theme as last time: only the bar heights and labels change
+        text_color = self.root.style.colors.fg
+        state = (tuple(roles), self.style.theme.name)
+        previous = self.chart_artists.get(fig)
+        if previous and previous[0] == state:
+            for container, labels, values in zip(*previous[1], (overall_matches, skill_matches, exp_matches)):
+                for bar, label, value in zip(container, labels, values):
+                    bar.set_height(value)
+                    label.xy = (bar.get_x() + bar.get_width() / 2, value)
+                    label.set_text(f"{value:.1f}%")
+            return
+
         # Create DataFrame for seaborn
         df = pd.DataFrame({
             'Role': roles * 3,
@@ -1049,13 +1258,10 @@ class ResumeAnalyzer:
             'Percentage': overall_matches + skill_matches + exp_matches
         })
 
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(10, 6))
-        fig.patch.set_facecolor(self.root.style.colors.bg) # Match fig background to app
-        ax.set_facecolor(self.root.style.colors.bg) # Match plot background to app
+        # Draw into the reused figure
+        ax = self.style_chart_figure(fig)
 
         # --- Set text color for dark theme ---
-        text_color = self.root.style.colors.fg
         ax.tick_params(axis='x', colors=text_color)
         ax.tick_params(axis='y', colors=text_color)
         ax.xaxis.label.set_color(text_color)
@@ -1072,24 +1278,22 @@ class ResumeAnalyzer:
         ax.tick_params(axis='x', rotation=25) # Less rotation is cleaner
         
         legend = ax.legend(title='Match Type')
-        plt.setp(legend.get_texts(), color=text_color)
-        plt.setp(legend.get_title(), color=text_color)
+        for text in legend.get_texts():
+            text.set_color(text_color)
+        legend.get_title().set_color(text_color)
         
         ax.set_ylim(0, 100) # Ensure y-axis is 0-100
 
         # Add value labels on bars
+        labels = []
         for container in ax.containers:
-            ax.bar_label(container, fmt='%.1f%%', padding=3, fontsize=9, color=text_color)
-
-        plt.tight_layout()
+            labels.append(ax.bar_label(container, fmt='%.1f%%', padding=3, fontsize=9, color=text_color))
 
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+        fig.tight_layout()
+        self.chart_artists[fig] = (state, (list(ax.containers), labels))
 
     # --- NEW: Treemap Visualization ---
-    def create_skill_treemap(self, parent):
+    def create_skill_treemap(self, fig):
         all_found_skills = {}
         for role, data in self.analysis_results.items():
             for skill, count in data.get('found_skills', {}).items():
@@ -1105,10 +1309,8 @@ class ResumeAnalyzer:
         counts = list(all_found_skills.values())
         labels = [f"{skill}\n({count}x)" for skill, count in all_found_skills.items()]
         
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(10, 6))
-        fig.patch.set_facecolor(self.root.style.colors.bg)
-        ax.set_facecolor(self.root.style.colors.bg)
+        # Draw into the reused figure
+        ax = self.style_chart_figure(fig)
         
         text_color = self.root.style.colors.fg
         ax.title.set_color(text_color)
@@ -1121,18 +1323,13 @@ class ResumeAnalyzer:
             
             ax.set_title('Overall Skill Frequency Treemap', fontsize=16, fontweight='bold')
             ax.axis('off')
-            plt.tight_layout()
-            
-            # Embed in tkinter
-            canvas = FigureCanvasTkAgg(fig, parent)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+            fig.tight_layout()
             
         except Exception as e:
             print(f"Failed to create treemap: {e}")
     # ---------------------------------
 
-    def create_skill_breakdown_chart(self, parent):
+    def create_skill_breakdown_chart(self, fig):
         # Prepare data for horizontal bar chart of found skills
         all_found_skills = {}
         for role, data in self.analysis_results.items():
@@ -1150,10 +1347,8 @@ class ResumeAnalyzer:
         skills = [item[0] for item in sorted_skills[:15]]  # Top 15 skills
         counts = [item[1] for item in sorted_skills[:15]]
 
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(10, 8))
-        fig.patch.set_facecolor(self.root.style.colors.bg)
-        ax.set_facecolor(self.root.style.colors.bg)
+        # Draw into the reused figure
+        ax = self.style_chart_figure(fig)
         
         text_color = self.root.style.colors.fg
         ax.tick_params(axis='x', colors=text_color)
@@ -1179,14 +1374,9 @@ class ResumeAnalyzer:
         for i, v in enumerate(counts):
             ax.text(v + 0.1, i, str(v), va='center', color=text_color)
 
-        plt.tight_layout()
-
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+        fig.tight_layout()
 
-    def create_radar_chart(self, parent):
+    def create_radar_chart(self, fig):
         # Prepare data for radar chart
         categories = list(self.analysis_results.keys())
         N = len(categories)
@@ -1201,10 +1391,17 @@ class ResumeAnalyzer:
         angles = [n / float(N) * 2 * np.pi for n in range(N)]
         angles += angles[:1]  # Complete the circle
 
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw=dict(projection='polar'))
-        fig.patch.set_facecolor(self.root.style.colors.bg)
-        ax.set_facecolor(self.root.style.colors.bg)
+        # Same roles and theme as last time: only move the line and its fill
+        state = (tuple(categories), self.style.theme.name)
+        previous = self.chart_artists.get(fig)
+        if previous and previous[0] == state:
+            line, area = previous[1]
+            line.set_data(angles, values)
+            area.set_xy(np.column_stack([angles, values]))
+            return
+
+        # Draw into the reused figure
+        ax = self.style_chart_figure(fig, projection='polar')
 
         text_color = self.root.style.colors.fg
         ax.title.set_color(text_color)
@@ -1212,10 +1409,11 @@ class ResumeAnalyzer:
         primary_color = self.root.style.colors.primary
 
         # Plot data
-        ax.plot(angles, values, 'o-', linewidth=2, label='Overall Match', color=primary_color)
-        ax.fill(angles, values, color=primary_color, alpha=0.25)
+        line, = ax.plot(angles, values, 'o-', linewidth=2, label='Overall Match', color=primary_color)
+        area, = ax.fill(angles, values, color=primary_color, alpha=0.25)
         
         ax.tick_params(colors=text_color) # Ticks
+        ax.set_yticks(range(0, 101, 20))
         ax.set_yticklabels([f"{i}%" for i in range(0, 101, 20)], color=text_color)
 
         # Add category labels
@@ -1230,15 +1428,13 @@ class ResumeAnalyzer:
         # Add grid
         ax.grid(color=text_color, linestyle='--', linewidth=0.5, alpha=0.3)
         
-        plt.tight_layout()
-
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+        fig.tight_layout()
+        self.chart_artists[fig] = (state, (line, area))
 
     def run(self):
         self.root.mainloop()
+        self.analysis_jobs.shutdown()
+        self.upload_jobs.shutdown()
 
 # Run the application
 if __name__ == "__main__":
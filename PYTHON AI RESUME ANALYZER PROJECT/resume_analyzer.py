@@ -0,0 +1,298 @@
+"""Headless batch scoring for the AI Resume Analyzer.
+
+Scores every resume in a directory against the job roles catalog without
+opening the GUI:
+
+    python -m resume_analyzer score resumes/ --roles job_roles.json --out results.parquet
+
+One row is written per (resume, role). The output format follows the file
+extension of --out (.parquet, .csv or .json).
+
+Resumes can also be added to a persistent inverted index and queried for the
+best candidates of a role:
+
+    python -m resume_analyzer index resumes/ --index resume_index.json
+    python -m resume_analyzer top "Data Scientist" --index resume_index.json -k 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import closing
+from functools import partial
+
+import pandas as pd
+
+from resume_cache import DEFAULT_CACHE_DIR, ExtractionCache
+from resume_extract import extract_many, is_supported, iter_pages, run_many
+from resume_index import ResumeIndex
+from resume_matcher import RoleMatcher, RoleMatrix
+
+DEFAULT_INDEX_FILE = 'resume_index.json'
+RESULT_COLUMNS = ["resume", "role", "skill_match", "experience_match", "overall_match"]
+
+
+def load_roles(roles_file):
+    """Loads the job roles catalog used for a batch run."""
+    with open(roles_file, 'r') as f:
+        roles = json.load(f)
+    if not roles:
+        raise ValueError(f"No job roles are defined in {roles_file}")
+    return roles
+
+
+def iter_resume_files(directory):
+    """Yields every .pdf/.docx/.txt file under directory, in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if is_supported(name):
+                yield os.path.join(dirpath, name)
+
+
+def result_rows(resume_name, results):
+    """Flattens analyze results into one row per role."""
+    for role, data in results.items():
+        yield {
+            "resume": resume_name,
+            "role": role,
+            "skill_match": data["skill_match"],
+            "experience_match": data["experience_match"],
+            "overall_match": data["overall_match"],
+        }
+
+
+def score_directory(directory, job_roles, errors=None, workers=None, cache=None, batch_size=1024,
+                    max_pages=None):
+    """Extracts and scores every resume under directory.
+
+    Text extraction runs in a process pool (``workers`` processes, default one
+    per CPU), reads at most ``max_pages`` pages per file and is skipped for
+    files already in ``cache``. The roles catalog is compiled once into a
+    RoleMatrix and resumes are scored ``batch_size`` at a time. Files that
+    cannot be read are reported through ``errors`` (a list of (path, message))
+    and skipped.
+    """
+    role_matrix = RoleMatrix(job_roles)
+    rows = []
+    names, texts = [], []
+
+    def flush():
+        scores = role_matrix.score_batch(texts)
+        for i, resume_name in enumerate(names):
+            for r, role in enumerate(role_matrix.roles):
+                rows.append({
+                    "resume": resume_name,
+                    "role": role,
+                    "skill_match": scores["skill_match"][i, r],
+                    "experience_match": scores["experience_match"][i, r],
+                    "overall_match": scores["overall_match"][i, r],
+                })
+        names.clear()
+        texts.clear()
+
+    for file_path, text, page_count, elapsed in extract_many(iter_resume_files(directory),
+                                                             workers=workers, errors=errors, cache=cache,
+                                                             max_pages=max_pages):
+        names.append(os.path.relpath(file_path, directory))
+        texts.append(text)
+        if len(texts) >= batch_size:
+            flush()
+    if texts:
+        flush()
+
+    # Results arrive in completion order; keep the output stable
+    rows.sort(key=lambda row: row["resume"])
+    return rows
+
+
+# --- Streaming mode: each worker scores files page by page ---
+_worker_matcher = None
+
+
+def _init_stream_worker(job_roles):
+    global _worker_matcher
+    _worker_matcher = RoleMatcher(job_roles)
+
+
+def _stream_score_timed(file_path, max_pages=None):
+    """Worker task: (path, results, pages_read, elapsed seconds)."""
+    started = time.perf_counter()
+    with closing(iter_pages(file_path)) as pages:
+        results, pages_read = _worker_matcher.score_pages(pages, max_pages, stop_when_complete=True)
+    return file_path, results, pages_read, time.perf_counter() - started
+
+
+def score_directory_streaming(directory, job_roles, errors=None, workers=None, max_pages=None):
+    """Like score_directory(), but each file is matched page by page while it is read.
+
+    A file stops being read after ``max_pages`` pages or as soon as every
+    keyword of every role has been seen, so huge PDFs never sit in memory.
+    Skill and experience scores are unaffected by stopping early.
+    """
+    task = partial(_stream_score_timed, max_pages=max_pages)
+    rows = []
+    for file_path, results, pages_read, elapsed in run_many(task, iter_resume_files(directory), workers,
+                                                            errors=errors, initializer=_init_stream_worker,
+                                                            initargs=(job_roles,)):
+        rows.extend(result_rows(os.path.relpath(file_path, directory), results))
+    rows.sort(key=lambda row: row["resume"])
+    return rows
+
+
+def index_directory(directory, index, errors=None, workers=None, cache=None):
+    """Adds every resume under directory that is not indexed yet; returns how many were added."""
+    new_files = (path for path in iter_resume_files(directory)
+                 if os.path.relpath(path, directory) not in index)
+    added = 0
+    for file_path, text, page_count, elapsed in extract_many(new_files, workers=workers,
+                                                             errors=errors, cache=cache):
+        index.add(os.path.relpath(file_path, directory), text)
+        added += 1
+    return added
+
+
+def write_results(rows, out_path):
+    df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    ext = os.path.splitext(out_path)[1].lower()
+    if ext == '.parquet':
+        df.to_parquet(out_path, index=False)  # Needs pyarrow or fastparquet
+    elif ext == '.csv':
+        df.to_csv(out_path, index=False)
+    elif ext == '.json':
+        df.to_json(out_path, orient='records', indent=2)
+    else:
+        raise ValueError(f"Unsupported output format '{ext}'. Use .parquet, .csv or .json")
+    return df
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="resume_analyzer", description="Headless AI Resume Analyzer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    score = subparsers.add_parser("score", help="Score a directory of resumes against every job role")
+    score.add_argument("directory", help="Directory containing .pdf, .docx or .txt resumes")
+    score.add_argument("--roles", default="job_roles.json", help="Job roles catalog (default: job_roles.json)")
+    score.add_argument("--out", required=True, help="Output file (.parquet, .csv or .json)")
+    score.add_argument("--workers", type=int, default=None,
+                       help="Extraction processes (default: one per CPU, 1 disables the pool)")
+    score.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                       help=f"Extraction cache directory (default: {DEFAULT_CACHE_DIR})")
+    score.add_argument("--no-cache", action="store_true", help="Always re-extract every file")
+    score.add_argument("--max-pages", type=int, default=None, help="Read at most this many pages per file")
+    score.add_argument("--stop-when-complete", action="store_true",
+                       help="Match page by page and stop reading a file once every keyword was found "
+                            "(found-skill counts then cover only the pages read; disables the cache)")
+
+    index = subparsers.add_parser("index", help="Add a directory of resumes to the inverted index")
+    index.add_argument("directory", help="Directory containing .pdf, .docx or .txt resumes")
+    index.add_argument("--roles", default="job_roles.json", help="Job roles catalog (default: job_roles.json)")
+    index.add_argument("--index", default=DEFAULT_INDEX_FILE, help=f"Index file (default: {DEFAULT_INDEX_FILE})")
+    index.add_argument("--workers", type=int, default=None,
+                       help="Extraction processes (default: one per CPU, 1 disables the pool)")
+    index.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                       help=f"Extraction cache directory (default: {DEFAULT_CACHE_DIR})")
+    index.add_argument("--no-cache", action="store_true", help="Always re-extract every file")
+
+    top = subparsers.add_parser("top", help="List the best indexed resumes for a role")
+    top.add_argument("role", help="Role name from the roles catalog")
+    top.add_argument("--roles", default="job_roles.json", help="Job roles catalog (default: job_roles.json)")
+    top.add_argument("--index", default=DEFAULT_INDEX_FILE, help=f"Index file (default: {DEFAULT_INDEX_FILE})")
+    top.add_argument("-k", type=int, default=50, help="Number of candidates (default: 50)")
+
+    clear = subparsers.add_parser("clear-cache", help="Delete every cached extraction")
+    clear.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                       help=f"Extraction cache directory (default: {DEFAULT_CACHE_DIR})")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "clear-cache":
+        ExtractionCache(args.cache_dir).clear()
+        print(f"Cleared extraction cache in {args.cache_dir}")
+        return 0
+
+    try:
+        job_roles = load_roles(args.roles)
+    except (OSError, ValueError) as e:
+        print(f"Error loading roles: {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "top":
+        return run_top(args, job_roles)
+
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+
+    if args.command == "index":
+        return run_index(args, job_roles)
+
+    errors = []
+    if args.stop_when_complete:
+        rows = score_directory_streaming(args.directory, job_roles, errors, workers=args.workers,
+                                         max_pages=args.max_pages)
+    else:
+        cache = None if args.no_cache else ExtractionCache(args.cache_dir)
+        rows = score_directory(args.directory, job_roles, errors, workers=args.workers, cache=cache,
+                               max_pages=args.max_pages)
+    for file_path, message in errors:
+        print(f"Skipped {file_path}: {message}", file=sys.stderr)
+
+    try:
+        write_results(rows, args.out)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error writing results: {e}", file=sys.stderr)
+        return 1
+
+    scored = len(rows) // len(job_roles)
+    print(f"Scored {scored} resume(s) against {len(job_roles)} role(s) -> {args.out}")
+    return 0
+
+
+def run_index(args, job_roles):
+    if os.path.exists(args.index):
+        try:
+            index = ResumeIndex.load(args.index)
+        except (OSError, ValueError) as e:
+            print(f"Error loading index: {e}", file=sys.stderr)
+            return 2
+    else:
+        index = ResumeIndex.from_roles(job_roles)
+
+    cache = None if args.no_cache else ExtractionCache(args.cache_dir)
+    errors = []
+    added = index_directory(args.directory, index, errors, workers=args.workers, cache=cache)
+    for file_path, message in errors:
+        print(f"Skipped {file_path}: {message}", file=sys.stderr)
+
+    try:
+        index.save(args.index)
+    except OSError as e:
+        print(f"Error writing index: {e}", file=sys.stderr)
+        return 1
+    print(f"Indexed {added} new resume(s); {len(index)} in {args.index}")
+    return 0
+
+
+def run_top(args, job_roles):
+    if args.role not in job_roles:
+        print(f"Unknown role '{args.role}'. Available: {', '.join(job_roles)}", file=sys.stderr)
+        return 2
+    try:
+        index = ResumeIndex.load(args.index)
+        ranked = index.top_k(job_roles[args.role], args.k)
+    except (OSError, ValueError) as e:
+        print(f"Error querying index: {e}", file=sys.stderr)
+        return 2
+
+    for rank, (resume_name, overall_match) in enumerate(ranked, 1):
+        print(f"{rank:>4}. {overall_match:5.1f}%  {resume_name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from resume_extract import extract_document
+
+DEFAULT_CACHE_DIR = '.resume_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Bump when extraction output changes so old entries are ignored
+CACHE_VERSION = 1
+
+
+def file_hash(file_path):
+    """Returns the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Persistent cache of extracted resume text and first-page PDF previews.
+
+    Entries are keyed by the SHA-256 of the file content, so renamed or
+    re-uploaded copies of a resume hit the cache and edited files miss it.
+    The directory is kept under ``max_bytes`` by evicting the least recently
+    used entries.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = None  # OrderedDict of file name -> size, oldest first
+        self._total_bytes = 0
+
+    # --- Index of files on disk, loaded on first use ---
+    def _load_index(self):
+        if self._entries is not None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((name, size) for _, name, size in found)
+        self._total_bytes = sum(self._entries.values())
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _read(self, name):
+        with self._lock:
+            self._load_index()
+            if name not in self._entries:
+                return None
+            try:
+                with open(self._path(name), 'rb') as f:
+                    data = f.read()
+                os.utime(self._path(name))  # mtime doubles as last-access time
+            except OSError:
+                self._drop(name)
+                return None
+            self._entries.move_to_end(name)
+            return data
+
+    def _write(self, name, data):
+        with self._lock:
+            self._load_index()
+            tmp_path = self._path(name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(name))
+            self._total_bytes -= self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _drop(self, name):
+        self._total_bytes -= self._entries.pop(name, 0)
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+
+    # --- Extracted text ---
+    def key_for(self, file_path):
+        return file_hash(file_path)
+
+    def get(self, key):
+        """Returns the cached (text, page_count) for a content hash, or None."""
+        data = self._read(key + '.json')
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+        except ValueError:
+            return None
+        if entry.get("version") != CACHE_VERSION:
+            return None
+        return entry["text"], entry["page_count"]
+
+    def put(self, key, text, page_count):
+        entry = {"version": CACHE_VERSION, "text": text, "page_count": page_count}
+        self._write(key + '.json', json.dumps(entry).encode('utf-8'))
+
+    def extract(self, file_path, key=None, max_pages=None):
+        """Returns (text, page_count), extracting the file only on a cache miss."""
+        key = key or self.key_for(file_path)
+        if max_pages is not None:
+            key += f".p{max_pages}"  # A truncated extraction is its own entry
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        text, page_count = extract_document(file_path, max_pages)
+        self.put(key, text, page_count)
+        return text, page_count
+
+    # --- First-page preview (PNG bytes) ---
+    def get_preview(self, key):
+        return self._read(key + '.png')
+
+    def put_preview(self, key, png_bytes):
+        self._write(key + '.png', png_bytes)
+
+    # --- Invalidation ---
+    def invalidate(self, key):
+        """Removes every cached entry for a content hash (page-limited variants included)."""
+        with self._lock:
+            self._load_index()
+            for name in [n for n in self._entries if n.startswith(key + '.')]:
+                self._drop(name)
+
+    def invalidate_file(self, file_path):
+        self.invalidate(self.key_for(file_path))
+
+    def clear(self):
+        """Removes all cached entries."""
+        with self._lock:
+            self._load_index()
+            for name in list(self._entries):
+                self._drop(name)
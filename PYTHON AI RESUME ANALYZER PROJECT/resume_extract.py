@@ -0,0 +1,196 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import closing
+from functools import partial
+
+# --- Import file-reading libraries (handle errors if not installed) ---
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+# ---------------------------------------------------------------------
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+class UnsupportedFileError(ValueError):
+    """Raised for files that are not .pdf, .docx or .txt."""
+
+
+def is_supported(file_path):
+    return file_path.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def iter_pages(file_path):
+    """Yields the text of a .txt, .pdf or .docx resume one page at a time.
+
+    PDFs are read page by page, so only the current page is held in memory;
+    .txt and .docx files come out as a single page.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    # TXT file
+    if ext == '.txt':
+        with open(file_path, 'r', encoding='utf-8') as file:
+            yield file.read()
+
+    # PDF file
+    elif ext == '.pdf':
+        if fitz is None:
+            raise RuntimeError("PyMuPDF is not installed. Please run: pip install PyMuPDF")
+        pdf_doc = fitz.open(file_path)
+        try:
+            for page in pdf_doc:
+                yield page.get_text()
+        finally:
+            pdf_doc.close()
+
+    # Word file (.docx)
+    elif ext == '.docx':
+        if Document is None:
+            raise RuntimeError("python-docx is not installed. Please run: pip install python-docx")
+        doc = Document(file_path)
+        yield "".join(para.text + "\n" for para in doc.paragraphs)
+
+    else:
+        raise UnsupportedFileError(f"Unsupported file type: {os.path.basename(file_path)}")
+
+
+def extract_document(file_path, max_pages=None):
+    """Returns (text, pages_read) for a .txt, .pdf or .docx resume.
+
+    Reading stops after ``max_pages`` pages. Pages are joined once instead of
+    growing a string page by page.
+    """
+    pages = []
+    with closing(iter_pages(file_path)) as page_iter:
+        for page_text in page_iter:
+            if max_pages is not None and len(pages) >= max_pages:
+                break
+            pages.append(page_text)
+    return "".join(pages), len(pages)
+
+
+def extract_text(file_path):
+    """Returns the plain text of a .txt, .pdf or .docx resume."""
+    return extract_document(file_path)[0]
+
+
+def _extract_timed(file_path, max_pages=None):
+    """Worker task: (path, text, page_count, elapsed seconds)."""
+    started = time.perf_counter()
+    text, page_count = extract_document(file_path, max_pages)
+    return file_path, text, page_count, time.perf_counter() - started
+
+
+def run_many(task, items, workers=None, max_pending=None, errors=None, lookup=None, store=None,
+             initializer=None, initargs=()):
+    """Runs ``task(item)`` over many items in a process pool, yielding results as they finish.
+
+    ``items`` may be any iterable (e.g. a lazy directory walk); at most
+    ``max_pending`` items are queued or in flight at once (default: 2 per
+    worker), so memory stays flat however large the batch is. Items whose
+    task fails are appended to ``errors`` as (item, message) and skipped.
+
+    ``lookup(item)`` may return (key, result) to answer an item without the
+    pool (result None means a miss); ``store(key, result)`` is then called
+    with every computed result.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max(max_pending or workers * 2, 1)
+    items = iter(items)
+
+    def report(item, e):
+        if errors is not None:
+            errors.append((item, str(e)))
+
+    def check(item):
+        if lookup is None:
+            return None, None
+        return lookup(item)
+
+    if workers == 1:
+        # No point paying for a process pool
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            try:
+                key, result = check(item)
+                if result is None:
+                    result = task(item)
+                    if store is not None:
+                        store(key, result)
+            except Exception as e:
+                report(item, e)
+                continue
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = {}
+        exhausted = False
+        while True:
+            # Top the bounded queue back up
+            while not exhausted and len(pending) < max_pending:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    break
+                try:
+                    key, result = check(item)
+                except Exception as e:
+                    report(item, e)
+                    continue
+                if result is not None:
+                    yield result
+                    continue
+                pending[pool.submit(task, item)] = (item, key)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, key = pending.pop(future)
+                try:
+                    result = future.result()
+                    if store is not None:
+                        store(key, result)
+                except Exception as e:
+                    report(item, e)
+                    continue
+                yield result
+
+
+def extract_many(file_paths, workers=None, max_pending=None, errors=None, cache=None, max_pages=None):
+    """Extracts many files in parallel, yielding results as each one finishes.
+
+    Yields (path, text, page_count, elapsed) in completion order; see
+    run_many() for the bounded queue and error handling. With an
+    ExtractionCache, files whose content was extracted before are served
+    from the cache and never reach the pool. ``max_pages`` stops reading
+    long PDFs early.
+    """
+    task = partial(_extract_timed, max_pages=max_pages) if max_pages is not None else _extract_timed
+    lookup = store = None
+
+    if cache is not None:
+        def lookup(file_path):
+            started = time.perf_counter()
+            key = cache.key_for(file_path)
+            if max_pages is not None:
+                key += f".p{max_pages}"  # A truncated extraction is its own entry
+            cached = cache.get(key)
+            if cached is None:
+                return key, None
+            return key, (file_path, cached[0], cached[1], time.perf_counter() - started)
+
+        def store(key, result):
+            cache.put(key, result[1], result[2])
+
+    return run_many(task, file_paths, workers, max_pending, errors, lookup, store)
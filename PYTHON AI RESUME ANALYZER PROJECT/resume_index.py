@@ -0,0 +1,177 @@
+import heapq
+import json
+import os
+from bisect import bisect_left
+
+from resume_matcher import EXPERIENCE_WEIGHT, SKILL_WEIGHT, KeywordMatcher, role_terms
+
+INDEX_VERSION = 2
+
+
+def role_term_contributions(role_data):
+    """Returns {term: points added to overall_match when the term is present}.
+
+    Role scores are capped (a keyword counts once however often it appears),
+    so a resume's overall match is just the sum of these contributions over
+    the keywords it contains.
+    """
+    keywords = role_data.get("keywords", {})
+    exp_keywords = role_data.get("experience_keywords", {})
+    max_skill_score = sum(keywords.values())
+    max_exp_score = sum(exp_keywords.values())
+
+    contributions = {}
+    if max_skill_score > 0:
+        for term, weight in keywords.items():
+            contributions[term] = contributions.get(term, 0) + weight / max_skill_score * 100 * SKILL_WEIGHT
+    if max_exp_score > 0:
+        for term, weight in exp_keywords.items():
+            contributions[term] = contributions.get(term, 0) + weight / max_exp_score * 100 * EXPERIENCE_WEIGHT
+    return {term: c for term, c in contributions.items() if c > 0}
+
+
+class ResumeIndex:
+    """Inverted index: keyword -> posting list of (resume id, count).
+
+    Resumes are tokenized with the same KeywordMatcher the analyzer scores
+    with, so the indexed terms are the keywords of the roles catalog the
+    index was built for. Resume ids are assigned in insertion order, which
+    keeps every posting list sorted while new resumes are appended.
+    """
+
+    def __init__(self, terms):
+        self.matcher = KeywordMatcher(terms)
+        self.postings = {term: ([], []) for term in self.matcher.terms}  # term -> (ids, counts)
+        self.resume_names = []
+        self._ids = {}
+
+    @classmethod
+    def from_roles(cls, job_roles):
+        return cls(role_terms(job_roles))
+
+    def __len__(self):
+        return len(self.resume_names)
+
+    def __contains__(self, resume_name):
+        return resume_name in self._ids
+
+    def add(self, resume_name, text):
+        """Indexes one resume and returns its id."""
+        if resume_name in self._ids:
+            raise ValueError(f"'{resume_name}' is already indexed")
+        resume_id = len(self.resume_names)
+        self.resume_names.append(resume_name)
+        self._ids[resume_name] = resume_id
+        for term, count in self.matcher.count(text).items():
+            ids, counts = self.postings[term]
+            ids.append(resume_id)
+            counts.append(count)
+        return resume_id
+
+    def term_counts(self, resume_name, terms):
+        """Returns {term: count} of the given terms in an indexed resume."""
+        resume_id = self._ids[resume_name]
+        found = {}
+        for term in terms:
+            ids, counts = self.postings.get(term, ((), ()))
+            i = bisect_left(ids, resume_id)
+            if i < len(ids) and ids[i] == resume_id:
+                found[term] = counts[i]
+        return found
+
+    def top_k(self, role_data, k=50):
+        """Returns the k best [(resume name, overall_match)] for a role, best first.
+
+        Uses MaxScore pruning: keywords are ordered by how much they can add
+        to a score, and once the k-th best score can no longer be reached by
+        the low-value keywords alone, resumes that only contain those keywords
+        are never visited. Resumes with none of the role's keywords are not returned.
+        Ties at the k-th score go to the resume that was indexed first.
+        """
+        contributions = role_term_contributions(role_data)
+        missing = [term for term in contributions if term not in self.postings]
+        if missing:
+            raise ValueError(f"Keywords not in the index (rebuild it for the current roles): {', '.join(sorted(missing))}")
+        if k <= 0:
+            return []
+
+        # Terms by ascending contribution, with running upper bounds
+        terms = sorted((t for t in contributions if self.postings[t][0]), key=lambda t: contributions[t])
+        weights = [contributions[t] for t in terms]
+        lists = [self.postings[t][0] for t in terms]
+        upper_bounds = []
+        total = 0
+        for w in weights:
+            total += w
+            upper_bounds.append(total)
+
+        cursors = [0] * len(terms)
+        top = []  # min-heap of (score, -resume id)
+        threshold = 0.0
+        first_essential = 0
+
+        while first_essential < len(terms):
+            # Next candidate: smallest id left in any essential list
+            candidate = None
+            for i in range(first_essential, len(terms)):
+                if cursors[i] < len(lists[i]):
+                    resume_id = lists[i][cursors[i]]
+                    if candidate is None or resume_id < candidate:
+                        candidate = resume_id
+            if candidate is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, len(terms)):
+                ids = lists[i]
+                if cursors[i] < len(ids) and ids[cursors[i]] == candidate:
+                    score += weights[i]
+                    cursors[i] += 1
+
+            # Non-essential terms, highest value first, while they can still matter
+            for i in range(first_essential - 1, -1, -1):
+                if score + upper_bounds[i] < threshold:
+                    break
+                ids = lists[i]
+                cursors[i] = bisect_left(ids, candidate, cursors[i])
+                if cursors[i] < len(ids) and ids[cursors[i]] == candidate:
+                    score += weights[i]
+
+            if len(top) < k:
+                heapq.heappush(top, (score, -candidate))
+            elif score > threshold:
+                heapq.heapreplace(top, (score, -candidate))
+            else:
+                continue
+            if len(top) == k:
+                threshold = top[0][0]
+                while first_essential < len(terms) and upper_bounds[first_essential] < threshold:
+                    first_essential += 1
+
+        ranked = sorted(top, key=lambda item: (-item[0], -item[1]))
+        return [(self.resume_names[-neg_id], score) for score, neg_id in ranked]
+
+    # --- Persistence ---
+    def save(self, index_file):
+        data = {
+            "version": INDEX_VERSION,
+            "resumes": self.resume_names,
+            "postings": {term: [ids, counts] for term, (ids, counts) in self.postings.items()},
+        }
+        tmp_file = index_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, index_file)
+
+    @classmethod
+    def load(cls, index_file):
+        with open(index_file, 'r') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{index_file} was built by an incompatible version; please rebuild it")
+        index = cls(data["postings"].keys())
+        index.resume_names = data["resumes"]
+        index._ids = {name: i for i, name in enumerate(index.resume_names)}
+        for term, (ids, counts) in data["postings"].items():
+            index.postings[term] = (ids, counts)
+        return index
@@ -0,0 +1,121 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once it has been cancelled or superseded."""
+
+
+class Job:
+    """Handle passed to a running job for progress reports and cancellation checks."""
+
+    def __init__(self, job_id, events, on_done=None, on_error=None, on_progress=None):
+        self.id = job_id
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._events = events
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check(self):
+        """Stops the job (raises JobCancelled) if it was cancelled."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, fraction, message=""):
+        """Reports progress (0.0 - 1.0); also a cancellation point."""
+        self.check()
+        self._events.put(("progress", self, (fraction, message)))
+
+
+class JobScheduler:
+    """Runs jobs on worker threads and hands their results back to the Tk thread.
+
+    Jobs must not touch Tk widgets. Their callbacks (on_done, on_error,
+    on_progress) are called from a ``root.after`` poll on the Tk thread.
+    Submitting a job supersedes the one still running: it is cancelled and
+    whatever it returns is dropped.
+    """
+
+    def __init__(self, root, poll_ms=50, max_workers=2):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._events = queue.Queue()
+        self._current = None
+        self._next_id = 0
+        self._polling = False
+
+    @property
+    def busy(self):
+        return self._current is not None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None):
+        """Starts fn(job, *args) on a worker thread and returns its Job."""
+        self.cancel()
+        self._next_id += 1
+        job = Job(self._next_id, self._events, on_done, on_error, on_progress)
+        self._current = job
+        self._executor.submit(self._run, job, fn, args)
+        self._schedule_poll()
+        return job
+
+    def cancel(self):
+        """Cancels the running job, if any."""
+        if self._current is not None:
+            self._current.cancel()
+            self._current = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, job, fn, args):
+        # Worker thread
+        try:
+            job.check()
+            result = fn(job, *args)
+            job.check()
+        except JobCancelled:
+            return
+        except Exception as e:
+            self._events.put(("error", job, e))
+            return
+        self._events.put(("done", job, result))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        # Tk thread
+        self._polling = False
+        try:
+            while True:
+                try:
+                    kind, job, payload = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not self._current or job.cancelled:
+                    continue  # Superseded or cancelled: drop it
+                if kind == "progress":
+                    if job.on_progress:
+                        job.on_progress(*payload)
+                    continue
+                self._current = None
+                callback = job.on_done if kind == "done" else job.on_error
+                if callback:
+                    callback(payload)
+        finally:
+            # A raising callback must not stop the polling of later events
+            if self._current is not None or not self._events.empty():
+                self._schedule_poll()
@@ -0,0 +1,406 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Optional: sparse keyword-count matrices for big catalogs (dense NumPy otherwise)
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+# Scoring weights used for the overall match (same as the GUI has always used)
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+
+_TERMINAL = object()  # Marks the end of a keyword inside the trie
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _is_word_char(ch):
+    """Matches the definition of \\w used by the re module."""
+    return ch.isalnum() or ch == "_"
+
+
+def normalize_text(text):
+    """Lower-cases text and collapses whitespace runs (line and page breaks too) to one space.
+
+    This lets a phrase like "machine learning" match when it is split over
+    two lines or two PDF pages.
+    """
+    return _WHITESPACE_RE.sub(" ", text.lower())
+
+
+def role_terms(job_roles):
+    """Returns every distinct keyword used by any role (skills and experience)."""
+    terms = set()
+    for role_data in job_roles.values():
+        terms.update(role_data.get("keywords", {}))
+        terms.update(role_data.get("experience_keywords", {}))
+    terms.discard("")
+    return terms
+
+
+class KeywordMatcher:
+    """Counts whole-word occurrences of many keywords in a single pass.
+
+    Gives the same counts as running
+    ``re.findall(r'\\b' + re.escape(term) + r'\\b', normalize_text(text))``
+    once per term, but the text is scanned only once no matter how many terms
+    there are.
+    """
+
+    def __init__(self, terms):
+        self.terms = frozenset(t for t in terms if t)
+
+        # Character trie of all (normalized) terms; a terminal lists the
+        # original spellings that normalize to it
+        self._trie = {}
+        for term in self.terms:
+            key = normalize_text(term)
+            if not key:
+                continue
+            node = self._trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_TERMINAL] = node.get(_TERMINAL, ()) + (term,)
+        self.max_term_length = max((len(normalize_text(t)) for t in self.terms), default=0)
+
+        # A keyword can only start where its own \b holds, so the candidate
+        # start positions are found at C speed with two character classes:
+        # word-char starts after a non-word char, non-word starts after a word char.
+        first_chars = {ch for ch in self._trie if ch is not _TERMINAL}
+        word_first = sorted(ch for ch in first_chars if _is_word_char(ch))
+        other_first = sorted(ch for ch in first_chars if not _is_word_char(ch))
+        alternatives = []
+        if word_first:
+            alternatives.append(r"(?<!\w)(?=[" + "".join(re.escape(c) for c in word_first) + "])")
+        if other_first:
+            alternatives.append(r"(?<=\w)(?=[" + "".join(re.escape(c) for c in other_first) + "])")
+        self._start_re = re.compile("|".join(alternatives)) if alternatives else None
+
+    def count(self, text):
+        """Returns {term: occurrences} for every term found in the text."""
+        counts = {}
+        self.scan(normalize_text(text), counts, {})
+        return counts
+
+    def scan(self, text, counts, last_end, pos=0, endpos=None, offset=0):
+        """Adds the matches starting in text[pos:endpos] to ``counts``.
+
+        ``text`` must already be normalized. ``last_end`` maps a matched key to
+        the absolute end of its previous match so that, like re.findall,
+        matches of the same term never overlap. ``offset`` is the absolute
+        position of text[0], which lets callers feed text in chunks.
+        """
+        if self._start_re is None:
+            return counts
+        n = len(text)
+        if endpos is None:
+            endpos = n
+        trie = self._trie
+        for m in self._start_re.finditer(text, pos, endpos):
+            start = m.start()
+            node = trie
+            j = start
+            while j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                terms = node.get(_TERMINAL)
+                if terms is None:
+                    continue
+                # Closing \b: word-ness must change between text[j-1] and text[j]
+                if _is_word_char(text[j - 1]):
+                    if j < n and _is_word_char(text[j]):
+                        continue
+                elif j >= n or not _is_word_char(text[j]):
+                    continue
+                if offset + start < last_end.get(terms, 0):
+                    continue
+                last_end[terms] = offset + j
+                for term in terms:
+                    counts[term] = counts.get(term, 0) + 1
+        return counts
+
+
+class StreamingMatcher:
+    """Feeds text to a KeywordMatcher piece by piece, e.g. one PDF page at a time.
+
+    Only the last ``max_term_length`` characters are carried over between
+    pieces, so memory stays flat however long the document is, and phrases
+    split across a page boundary still match.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.counts = {}
+        self._last_end = {}
+        self._buffer = ""  # Normalized text that may still hold match starts
+        self._offset = 0  # Absolute position of _buffer[0]
+        self._next_start = 0  # Absolute position of the first unscanned match start
+
+    @property
+    def complete(self):
+        """True once every keyword has been seen at least once."""
+        return len(self.counts) == len(self.matcher.terms)
+
+    def feed(self, chunk):
+        chunk = normalize_text(chunk)
+        if chunk.startswith(" ") and self._buffer.endswith(" "):
+            chunk = chunk[1:]  # Whitespace run continues across the boundary
+        self._buffer += chunk
+
+        # A match starting before `safe` ends before the buffer does, so the
+        # character after it (needed for the closing \b) is already known
+        safe = len(self._buffer) - self.matcher.max_term_length
+        pos = self._next_start - self._offset
+        if safe <= pos:
+            return
+        self.matcher.scan(self._buffer, self.counts, self._last_end, pos, safe, self._offset)
+        self._next_start = self._offset + safe
+
+        # Keep one character before the next start for the opening \b
+        drop = safe - 1
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._offset += drop
+
+    def finish(self):
+        """Scans what is left and returns the final counts."""
+        pos = self._next_start - self._offset
+        self.matcher.scan(self._buffer, self.counts, self._last_end, pos, None, self._offset)
+        self._next_start = self._offset + len(self._buffer)
+        return self.counts
+
+
+def score_role(role_data, term_counts):
+    """Scores one role from precomputed keyword counts."""
+    keywords = role_data.get("keywords", {})
+    exp_keywords = role_data.get("experience_keywords", {})
+
+    # Capped scoring: a keyword adds its weight once, however often it appears
+    max_skill_score = sum(keywords.values())
+    found_skills = {skill: term_counts[skill] for skill in keywords if term_counts.get(skill)}
+    skill_score_capped = sum(keywords[skill] for skill in found_skills)
+    skill_match_percentage = (skill_score_capped / max_skill_score) * 100 if max_skill_score > 0 else 0
+
+    max_exp_score = sum(exp_keywords.values())
+    found_exp = {kw: term_counts[kw] for kw in exp_keywords if term_counts.get(kw)}
+    exp_score_capped = sum(exp_keywords[kw] for kw in found_exp)
+    exp_match_percentage = (exp_score_capped / max_exp_score) * 100 if max_exp_score > 0 else 0
+
+    overall_match = (skill_match_percentage * SKILL_WEIGHT) + (exp_match_percentage * EXPERIENCE_WEIGHT)
+
+    return {
+        "skill_match": skill_match_percentage,
+        "experience_match": exp_match_percentage,
+        "overall_match": overall_match,
+        "found_skills": found_skills,  # Uncapped counts, for user info
+        "found_experience": found_exp,
+        "missing_skills": [skill for skill in keywords if skill not in found_skills]
+    }
+
+
+def score_roles(job_roles, term_counts):
+    """Scores every role from one set of keyword counts."""
+    return {role: score_role(role_data, term_counts) for role, role_data in job_roles.items()}
+
+
+class RoleMatcher:
+    """A KeywordMatcher compiled once from a job roles catalog."""
+
+    def __init__(self, job_roles):
+        self.job_roles = job_roles
+        self.matcher = KeywordMatcher(role_terms(job_roles))
+
+    def count(self, text):
+        return self.matcher.count(text)
+
+    def score(self, text):
+        """Returns the per-role analysis results for a resume text."""
+        return score_roles(self.job_roles, self.count(text))
+
+    def score_pages(self, pages, max_pages=None, stop_when_complete=False):
+        """Scores a resume given as an iterable of page texts.
+
+        Pages are consumed one at a time. Reading stops after ``max_pages``
+        pages, or with ``stop_when_complete`` as soon as every keyword has
+        been seen (capped scores cannot change after that, although the
+        reported occurrence counts then cover only the pages read).
+        Returns (results, pages_read).
+        """
+        stream = StreamingMatcher(self.matcher)
+        pages_read = 0
+        for page_text in pages:
+            if max_pages is not None and pages_read >= max_pages:
+                break
+            stream.feed(page_text)
+            pages_read += 1
+            if stop_when_complete and stream.complete:
+                break
+        return score_roles(self.job_roles, stream.finish()), pages_read
+
+
+class RoleMatrix:
+    """The roles catalog compiled into roles x vocabulary weight matrices.
+
+    Scoring N resumes against R roles becomes a few matrix products over the
+    resumes' keyword-presence matrix and gives the same numbers as
+    score_roles(). Results are N x R arrays with roles in catalog order.
+    """
+
+    def __init__(self, job_roles):
+        self.job_roles = job_roles
+        self.roles = list(job_roles)
+        self.vocabulary = sorted(role_terms(job_roles))
+        self.term_index = {term: i for i, term in enumerate(self.vocabulary)}
+        self.matcher = KeywordMatcher(self.vocabulary)
+
+        shape = (len(self.roles), len(self.vocabulary))
+        self.skill_weights = np.zeros(shape)
+        self.experience_weights = np.zeros(shape)
+        for r, role in enumerate(self.roles):
+            role_data = job_roles[role]
+            for term, weight in role_data.get("keywords", {}).items():
+                if term in self.term_index:
+                    self.skill_weights[r, self.term_index[term]] = weight
+            for term, weight in role_data.get("experience_keywords", {}).items():
+                if term in self.term_index:
+                    self.experience_weights[r, self.term_index[term]] = weight
+        self.max_skill_score = self.skill_weights.sum(axis=1)
+        self.max_experience_score = self.experience_weights.sum(axis=1)
+
+    def count_matrix(self, texts):
+        """Keyword counts of each text, as an N x V matrix (sparse CSR if SciPy is available)."""
+        rows, cols, values = [], [], []
+        n = 0
+        for n, text in enumerate(texts, 1):
+            for term, count in self.matcher.count(text).items():
+                rows.append(n - 1)
+                cols.append(self.term_index[term])
+                values.append(count)
+        shape = (n, len(self.vocabulary))
+        if sparse is not None:
+            return sparse.csr_matrix((values, (rows, cols)), shape=shape)
+        counts = np.zeros(shape)
+        counts[rows, cols] = values
+        return counts
+
+    def score_counts(self, counts):
+        """Scores an N x V count matrix; returns {"skill_match": N x R, ...}."""
+        presence = counts > 0
+        if sparse is not None and sparse.issparse(presence):
+            presence = presence.astype(np.float64)
+            skill_found = np.asarray(presence @ self.skill_weights.T)
+            exp_found = np.asarray(presence @ self.experience_weights.T)
+        else:
+            presence = np.asarray(presence, dtype=np.float64)
+            skill_found = presence @ self.skill_weights.T
+            exp_found = presence @ self.experience_weights.T
+
+        # Same capped percentages as score_role(); roles without keywords score 0
+        skill_match = np.divide(skill_found, self.max_skill_score, out=np.zeros_like(skill_found),
+                                where=self.max_skill_score > 0) * 100
+        experience_match = np.divide(exp_found, self.max_experience_score, out=np.zeros_like(exp_found),
+                                     where=self.max_experience_score > 0) * 100
+        overall_match = (skill_match * SKILL_WEIGHT) + (experience_match * EXPERIENCE_WEIGHT)
+        return {
+            "skill_match": skill_match,
+            "experience_match": experience_match,
+            "overall_match": overall_match,
+        }
+
+    def score_batch(self, texts, chunk_size=1024):
+        """Scores many resumes at once; each result is an N x R array."""
+        texts = list(texts)
+        if not texts:
+            empty = np.zeros((0, len(self.roles)))
+            return {"skill_match": empty, "experience_match": empty.copy(), "overall_match": empty.copy()}
+        chunks = [self.score_counts(self.count_matrix(texts[i:i + chunk_size]))
+                  for i in range(0, len(texts), chunk_size)]
+        return {key: np.vstack([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+
+class IncrementalScorer:
+    """Caches keyword counts per resume so that editing a role is cheap.
+
+    Every scored resume keeps its keyword-count vector. When one role is
+    added, edited or deleted only that role is rescored for the cached
+    resumes; the text is rescanned only for keywords no role used before.
+    """
+
+    def __init__(self, job_roles, max_resumes=500):
+        self.job_roles = dict(job_roles)
+        self.max_resumes = max_resumes
+        self._lock = threading.RLock()
+        self._vocabulary = role_terms(self.job_roles)
+        self._matcher = None
+        self._texts = OrderedDict()  # resume id -> normalized text, least recently used first
+        self._counts = {}  # resume id -> {term: count} over self._vocabulary
+        self._results = {}  # resume id -> {role: result}
+
+    @staticmethod
+    def resume_id(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def score(self, text):
+        """Returns the per-role results for a resume, scanning it only the first time."""
+        rid = self.resume_id(text)
+        with self._lock:
+            if rid in self._results:
+                self._texts.move_to_end(rid)
+                return dict(self._results[rid])
+
+            if self._matcher is None:
+                self._matcher = KeywordMatcher(self._vocabulary)
+            normalized = normalize_text(text)
+            counts = {}
+            self._matcher.scan(normalized, counts, {})
+            self._texts[rid] = normalized
+            self._counts[rid] = counts
+            self._results[rid] = score_roles(self.job_roles, counts)
+
+            while len(self._texts) > self.max_resumes:
+                old_rid, _ = self._texts.popitem(last=False)
+                del self._counts[old_rid]
+                del self._results[old_rid]
+            return dict(self._results[rid])
+
+    def update_role(self, role, role_data):
+        """Adds or replaces one role and rescores only that role."""
+        with self._lock:
+            self.job_roles[role] = role_data
+            new_terms = role_terms({role: role_data}) - self._vocabulary
+            if new_terms:
+                # Count just the new keywords in the cached resumes
+                new_matcher = KeywordMatcher(new_terms)
+                for rid, normalized in self._texts.items():
+                    self._counts[rid].update(new_matcher.scan(normalized, {}, {}))
+                self._vocabulary |= new_terms
+                self._matcher = None  # Rebuilt with the larger vocabulary on next scan
+            for rid, counts in self._counts.items():
+                self._results[rid][role] = score_role(role_data, counts)
+
+    def remove_role(self, role):
+        with self._lock:
+            self.job_roles.pop(role, None)
+            for results in self._results.values():
+                results.pop(role, None)
+
+    def set_roles(self, job_roles):
+        """Switches to a new catalog, rescoring only the roles that differ."""
+        with self._lock:
+            for role in [r for r in self.job_roles if r not in job_roles]:
+                self.remove_role(role)
+            for role, role_data in job_roles.items():
+                if self.job_roles.get(role) != role_data:
+                    self.update_role(role, role_data)
+            # Follow the catalog's role order
+            self.job_roles = {role: self.job_roles[role] for role in job_roles}
+            for rid, results in self._results.items():
+                self._results[rid] = {role: results[role] for role in job_roles}
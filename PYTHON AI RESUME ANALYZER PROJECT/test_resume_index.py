@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from resume_index import ResumeIndex, role_term_contributions
+
+
+ROLE = {
+    "keywords": {"python": 4, "sql": 2, "docker": 2, "excel": 1, "git": 1},
+    "experience_keywords": {"lead": 2, "mentor": 1},
+}
+
+
+def exhaustive_top_k(index, role_data, k):
+    """Scores every resume and ranks by (score desc, id asc)."""
+    contributions = role_term_contributions(role_data)
+    ranked = []
+    for resume_id, name in enumerate(index.resume_names):
+        found = index.term_counts(name, contributions)
+        if found:
+            score = sum(contributions[term] for term in sorted(found, key=contributions.get))
+            ranked.append((-score, resume_id, name))
+    ranked.sort()
+    return [name for _, _, name in ranked[:k]]
+
+
+class TopKTest(unittest.TestCase):
+    def test_ties_at_kth_score_keep_earliest_resumes(self):
+        index = ResumeIndex.from_roles({"role": ROLE})
+        index.add("best", "python sql docker lead")
+        for i in range(6):
+            index.add(f"tied{i}", "python sql")  # All tied with each other
+        index.add("low", "excel")
+        index.add("late", "sql python")  # Same score as the tied ones, indexed last
+
+        names = [name for name, _ in index.top_k(ROLE, k=4)]
+        self.assertEqual(names, ["best", "tied0", "tied1", "tied2"])
+
+    def test_matches_exhaustive_ranking(self):
+        rng = random.Random(7)
+        terms = list(ROLE["keywords"]) + list(ROLE["experience_keywords"])
+        index = ResumeIndex.from_roles({"role": ROLE})
+        for i in range(300):
+            # Few distinct keyword sets, so many resumes tie
+            chosen = rng.sample(terms, rng.randint(0, 3))
+            index.add(f"resume{i}", " ".join(chosen))
+
+        for k in (1, 5, 20, 100, 400):
+            names = [name for name, _ in index.top_k(ROLE, k=k)]
+            self.assertEqual(names, exhaustive_top_k(index, ROLE, k), f"k={k}")
+
+
+if __name__ == "__main__":
+    unittest.main()
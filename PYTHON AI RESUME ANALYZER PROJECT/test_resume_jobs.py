@@ -0,0 +1,86 @@
+import time
+import unittest
+
+from resume_jobs import JobScheduler
+
+
+class FakeRoot:
+    """Stands in for the Tk root: collects root.after callbacks to run by hand."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, until, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not until():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for the job")
+            if self.pending:
+                self.pending.pop(0)()
+            else:
+                time.sleep(0.01)
+
+
+class StatusPanel:
+    """Mirrors ResumeAnalyzer.set_job_status / on_job_progress without Tk."""
+
+    def __init__(self):
+        self.messages = []
+        self.progress = 0
+
+    def set_job_status(self, message, fraction=None):
+        self.messages.append(message)
+        if fraction is not None:
+            self.progress = fraction * 100
+
+    def on_job_progress(self, fraction, message):
+        self.set_job_status(message, fraction)
+
+
+class JobSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.scheduler = JobScheduler(self.root, poll_ms=1)
+        self.addCleanup(self.scheduler.shutdown)
+
+    def test_progress_reaches_status_callback(self):
+        status = StatusPanel()
+        results = []
+
+        def work(job):
+            job.report(0.5, "Halfway...")
+            return "done"
+
+        self.scheduler.submit(work, on_done=results.append,
+                              on_progress=status.on_job_progress)
+        self.root.pump(lambda: results)
+
+        self.assertEqual(results, ["done"])
+        self.assertEqual(status.messages, ["Halfway..."])
+        self.assertEqual(status.progress, 50)
+        self.assertFalse(self.scheduler.busy)
+
+    def test_polling_survives_raising_callback(self):
+        results = []
+
+        def bad_progress(fraction, message):
+            raise ValueError("broken callback")
+
+        def work(job):
+            job.report(0.5, "Halfway...")
+            return "done"
+
+        self.scheduler.submit(work, on_done=results.append,
+                              on_progress=bad_progress)
+        with self.assertRaises(ValueError):
+            self.root.pump(lambda: results)
+        # The poll rescheduled itself, so the result still arrives
+        self.root.pump(lambda: results)
+        self.assertEqual(results, ["done"])
+
+
+if __name__ == "__main__":
+    unittest.main()